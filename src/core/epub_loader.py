@@ -1,19 +1,77 @@
-"""EPUB file loading module"""
+"""EPUB file loading module
+
+Parses the EPUB container directly with zipfile + xml.etree instead of a
+full ebooklib model: only the manifest/spine/TOC are parsed up front, and
+chapter/image bytes are read from the zip on demand.
+"""
 
 import os
-import base64
 import re
+import json
+import time
+import hashlib
+import zipfile
+import threading
+import posixpath
+import xml.etree.ElementTree as ET
 from collections import OrderedDict
+from pathlib import Path
 from urllib.parse import unquote
-from typing import Optional, List, Any, Dict, Tuple
+from typing import Optional, List, Dict, Tuple
 from concurrent.futures import ThreadPoolExecutor
 
+# Prefer pybase64 (SIMD-accelerated) for image encoding, fall back to stdlib
 try:
-    import ebooklib
-    from ebooklib import epub
+    import pybase64 as base64
 except ImportError:
-    print("请先安装依赖库: pip install ebooklib")
-    exit(1)
+    import base64
+
+# Pre-compiled once at import time; bytes mode so chapters never need a
+# full decode/encode round-trip on the render path
+_IMG_RE = re.compile(rb'<img[^>]+src=["\']([^"\'>]+)["\'][^>]*>', re.IGNORECASE)
+# Cheap probe for the text-only fast path; must match the same casings
+# _IMG_RE accepts (html chapters may carry <Img>, <IMG>, ...)
+_IMG_PROBE_RE = re.compile(rb"<img", re.IGNORECASE)
+
+# Encoding declared in an XML prolog or <meta charset=...> near the top
+_CHARSET_RE = re.compile(
+    rb'(?:encoding|charset)\s*=\s*["\']?\s*([A-Za-z0-9_\-]+)', re.IGNORECASE
+)
+
+
+def _local(tag: str) -> str:
+    """Strip the XML namespace from a tag name"""
+    return tag.rsplit("}", 1)[-1]
+
+
+def _to_utf8(content: bytes) -> bytes:
+    """Transcode chapter bytes to UTF-8 when they declare another encoding.
+
+    EPUB 3 mandates UTF-8 so the common case is a cheap sniff of the first
+    kilobyte and no copy at all; EPUB 2 books with GBK/Shift_JIS prologs get
+    transcoded once here instead of failing to render.
+    """
+    match = _CHARSET_RE.search(content[:1024])
+    if match:
+        charset = match.group(1).decode("ascii", "replace").lower()
+        if charset not in ("utf-8", "utf8"):
+            try:
+                return content.decode(charset, "replace").encode("utf-8")
+            except LookupError:
+                pass
+    return content
+
+
+def _last_path(s: str) -> str:
+    """Final path segment of an href/src.
+
+    unquote() scans and copies the whole string even when there is nothing
+    to decode, so skip it for the common ASCII-only case.
+    """
+    if '%' in s:
+        s = unquote(s)
+    i = s.rfind('/')
+    return s[i + 1:] if i >= 0 else s
 
 
 class EpubLoader:
@@ -29,18 +87,45 @@ class EpubLoader:
         "webp": "image/webp",
     }
 
-    # Maximum cache size to prevent memory bloat
-    MAX_CACHE_SIZE = 10
+    # Document media types that count as chapters
+    _DOC_TYPES = ("application/xhtml+xml", "text/html")
+
+    # Maximum cache budget (bytes of cached HTML) to prevent memory bloat;
+    # embedded images can make a single chapter several MB
+    CACHE_BYTES = int(os.environ.get("EPUB_CACHE_BYTES", 32 * 1024 * 1024))
+
+    # On-disk cache of rendered chapter HTML (skips re-embedding on reopen)
+    DISK_CACHE_DIR = Path.home() / ".epub_reader_pyqt_cache"
+    DISK_CACHE_MAX_AGE_DAYS = 30
 
     def __init__(self):
-        self._book: Optional[epub.EpubBook] = None
-        self._chapters: List[Any] = []
+        self._zip: Optional[zipfile.ZipFile] = None
+        self._chapters: List[str] = []  # Chapter zip paths in spine order
         # Use OrderedDict for LRU cache - order tracks access time
-        self._chapter_cache: OrderedDict[int, str] = OrderedDict()
-        self._image_index: Dict[str, Any] = {}
+        self._chapter_cache: OrderedDict[int, bytes] = OrderedDict()
+        self._cache_bytes = 0  # Running total of cached HTML length
+        # Guards cache/disk-dict mutations: get_chapter_content runs both on
+        # the UI thread and on preload executor threads
+        self._cache_lock = threading.Lock()
+        self._image_index: Dict[str, str] = {}  # Image basename -> zip path
+        # Cache of encoded data URIs keyed by zip path (images repeat across chapters)
+        self._data_uri_cache: Dict[str, bytes] = {}
+        self._flat_toc: Optional[list] = None  # Memoized flattened TOC
+        self._toc_entry: Optional[Tuple[str, str]] = None  # (kind, zip path) of nav/ncx
         self._show_images = True
-        self._executor = ThreadPoolExecutor(max_workers=2)
+        # Preload pool sized by CPU count, overridable via EPUB_THREADS
+        workers = int(os.environ.get("EPUB_THREADS", min(8, os.cpu_count() or 2)))
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers))
+        # Separate pool for image encoding so preload workers that wait on
+        # encode futures can never deadlock the shared pool
+        self._encode_executor = ThreadPoolExecutor(max_workers=max(1, workers))
         self._chapter_map: Dict[str, int] = {}  # Mapping from chapter filename to index
+        self._href_idx_cache: Dict[str, Optional[int]] = {}  # href -> chapter index memo
+        # Disk cache state for the currently open book
+        self._disk_cache_file: Optional[Path] = None
+        self._disk_chapters: Dict[int, str] = {}
+        self._disk_cache_dirty = False
+        self._purge_stale_disk_cache()
 
     def load_file(self, filepath: str) -> Tuple[bool, str]:
         """
@@ -50,85 +135,221 @@ class EpubLoader:
             (success, title) or (False, error_message)
         """
         try:
-            self._book = epub.read_epub(filepath)
-            
-            # Order chapters by spine (reading order), fallback to original order if no spine
-            if self._book.spine:
-                self._chapters = []
-                for spine_item in self._book.spine:
-                    href = spine_item[0]
-                    # Try get_item_with_href first, then fallback to get_item_with_id
-                    item = self._book.get_item_with_href(href)
-                    if not item:
-                        item = self._book.get_item_with_id(href)
-                    if item and item.get_type() == ebooklib.ITEM_DOCUMENT:
-                        self._chapters.append(item)
-            else:
-                # Fallback: use get_items() order
-                self._chapters = [
-                    item
-                    for item in self._book.get_items()
-                    if item.get_type() == ebooklib.ITEM_DOCUMENT
-                ]
-            
+            # Persist any rendered chapters of the previous book first
+            self._flush_disk_cache()
+            if self._zip:
+                self._zip.close()
+
+            self._zip = zipfile.ZipFile(filepath)
+            opf_path = self._find_opf_path()
+            opf_dir = posixpath.dirname(opf_path)
+            opf_root = ET.fromstring(self._zip.read(opf_path))
+
+            title = self._parse_opf(opf_root, opf_dir) or os.path.basename(filepath)
+
             # Build mapping from chapter filename to index
             self._chapter_map.clear()
-            for i, chapter in enumerate(self._chapters):
-                filename = os.path.basename(chapter.get_name())
-                self._chapter_map[filename] = i
-                
-            self._chapter_cache.clear()
-            self._build_image_index()
-
-            title_meta = self._book.get_metadata("DC", "title")
-            title = title_meta[0][0] if title_meta else os.path.basename(filepath)
+            self._href_idx_cache.clear()
+            for i, name in enumerate(self._chapters):
+                self._chapter_map[posixpath.basename(name)] = i
+
+            # A preload worker may be mid-insert for the previous book; take
+            # the lock so the clear can't interleave with it and leave the
+            # byte accounting (or a stale chapter) behind
+            with self._cache_lock:
+                self._chapter_cache.clear()
+                self._cache_bytes = 0
+            self._flat_toc = None
+            self._load_disk_cache(filepath)
+
             return True, title
         except Exception as e:
             return False, str(e)
 
-    def _build_image_index(self) -> None:
-        """Build image index for faster lookup"""
+    def _find_opf_path(self) -> str:
+        """Locate the OPF package file via META-INF/container.xml"""
+        assert self._zip is not None
+        root = ET.fromstring(self._zip.read("META-INF/container.xml"))
+        for elem in root.iter():
+            if _local(elem.tag) == "rootfile":
+                path = elem.get("full-path")
+                if path:
+                    return path
+        raise ValueError("container.xml has no rootfile entry")
+
+    def _parse_opf(self, opf_root: ET.Element, opf_dir: str) -> Optional[str]:
+        """Parse manifest/spine/metadata; populate chapters, images and TOC entry"""
+        title: Optional[str] = None
+        manifest: Dict[str, Tuple[str, str]] = {}  # id -> (zip path, media type)
+        spine_ids: List[str] = []
+        ncx_id: Optional[str] = None
         self._image_index.clear()
-        if not self._book:
+        self._data_uri_cache.clear()
+        self._toc_entry = None
+
+        for elem in opf_root.iter():
+            tag = _local(elem.tag)
+            if tag == "title" and title is None:
+                title = (elem.text or "").strip() or None
+            elif tag == "item":
+                item_id = elem.get("id")
+                href = elem.get("href")
+                media_type = elem.get("media-type", "")
+                if not item_id or not href:
+                    continue
+                path = posixpath.normpath(posixpath.join(opf_dir, unquote(href)))
+                manifest[item_id] = (path, media_type)
+                if media_type.startswith("image/"):
+                    # Canonical key: basename only (chapter srcs are relative
+                    # paths, so the full manifest name almost never matches)
+                    self._image_index[posixpath.basename(path)] = path
+                if "nav" in (elem.get("properties") or "").split():
+                    self._toc_entry = ("nav", path)
+                elif media_type == "application/x-dtbncx+xml":
+                    ncx_id = item_id
+            elif tag == "spine":
+                if elem.get("toc"):
+                    ncx_id = elem.get("toc")
+            elif tag == "itemref":
+                idref = elem.get("idref")
+                if idref:
+                    spine_ids.append(idref)
+
+        # EPUB 3 nav takes precedence; fall back to the EPUB 2 NCX
+        if self._toc_entry is None and ncx_id and ncx_id in manifest:
+            self._toc_entry = ("ncx", manifest[ncx_id][0])
+
+        # Order chapters by spine (reading order), fallback to manifest order
+        if spine_ids:
+            self._chapters = [
+                manifest[i][0]
+                for i in spine_ids
+                if i in manifest and manifest[i][1] in self._DOC_TYPES
+            ]
+        else:
+            self._chapters = [
+                path for path, media_type in manifest.values()
+                if media_type in self._DOC_TYPES
+            ]
+
+        return title
+
+    def _load_disk_cache(self, filepath: str) -> None:
+        """Load the rendered-chapter disk cache for the given book (if valid)"""
+        self._disk_chapters = {}
+        self._disk_cache_dirty = False
+        self._disk_cache_file = None
+        try:
+            stat = os.stat(filepath)
+            key = hashlib.blake2b(
+                f"{filepath}:{stat.st_mtime}:{stat.st_size}".encode("utf-8"),
+                digest_size=16,
+            ).hexdigest()
+            self._disk_cache_file = self.DISK_CACHE_DIR / f"{key}.json"
+            if self._disk_cache_file.exists():
+                with open(self._disk_cache_file, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                self._disk_chapters = {int(k): v for k, v in data.get("chapters", {}).items()}
+        except Exception:
+            self._disk_chapters = {}
+
+    def _flush_disk_cache(self) -> None:
+        """Write rendered chapters back to disk if anything changed"""
+        if not self._disk_cache_dirty or not self._disk_cache_file:
             return
+        try:
+            self.DISK_CACHE_DIR.mkdir(exist_ok=True)
+            tmp = self._disk_cache_file.with_suffix(".tmp")
+            # Snapshot under the lock: preload workers mutate the dict and a
+            # resize during json.dump would abort (and silently drop) the flush
+            with self._cache_lock:
+                chapters = dict(self._disk_chapters)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"chapters": chapters}, f, ensure_ascii=False)
+            os.replace(tmp, self._disk_cache_file)
+            self._disk_cache_dirty = False
+        except Exception:
+            pass
 
-        for item in self._book.get_items():
-            if item.get_type() == ebooklib.ITEM_IMAGE:
-                name = item.get_name()
-                # Index multiple path forms
-                self._image_index[name] = item
-                self._image_index[name.split("/")[-1]] = item
-                self._image_index[os.path.basename(name)] = item
+    def _purge_stale_disk_cache(self) -> None:
+        """Remove cache files that haven't been touched in DISK_CACHE_MAX_AGE_DAYS"""
+        try:
+            cutoff = time.time() - self.DISK_CACHE_MAX_AGE_DAYS * 86400
+            for path in self.DISK_CACHE_DIR.glob("*.json"):
+                if path.stat().st_mtime < cutoff:
+                    path.unlink(missing_ok=True)
+        except Exception:
+            pass
 
     def set_image_visibility(self, visible: bool) -> None:
         """Set image visibility state"""
         if self._show_images != visible:
             self._show_images = visible
-            self._chapter_cache.clear()
+            # Entries were rendered for the other mode; clear under the lock
+            # so racing preload inserts can't corrupt the byte count
+            with self._cache_lock:
+                self._chapter_cache.clear()
+                self._cache_bytes = 0
+
+    def get_cached_chapter(self, index: int) -> Optional[bytes]:
+        """Return a chapter from the in-memory cache, or None without loading.
 
-    def get_chapter_content(self, index: int) -> Optional[str]:
-        """Get chapter HTML content with LRU caching"""
-        if not (0 <= index < len(self._chapters)):
+        Lets the UI show cached chapters immediately and push cold loads
+        (zip read + parse) onto a worker thread instead of blocking.
+        """
+        with self._cache_lock:
+            if index in self._chapter_cache:
+                # Move to end to mark as recently used
+                content = self._chapter_cache.pop(index)
+                self._chapter_cache[index] = content
+                return content
+        return None
+
+    def get_chapter_content(self, index: int) -> Optional[bytes]:
+        """Get chapter HTML content (UTF-8 bytes) with LRU caching.
+
+        Bytes are returned so the WebEngine view can consume the buffer
+        directly without another str->bytes encode per page flip.
+        """
+        if not (0 <= index < len(self._chapters)) or not self._zip:
             return None
 
         # Return cached content and update LRU order
-        if index in self._chapter_cache:
-            # Move to end to mark as recently used
-            content = self._chapter_cache.pop(index)
-            self._chapter_cache[index] = content
-            return content
+        with self._cache_lock:
+            if index in self._chapter_cache:
+                # Move to end to mark as recently used
+                content = self._chapter_cache.pop(index)
+                self._chapter_cache[index] = content
+                return content
 
         try:
-            content = self._chapters[index].get_content().decode("utf-8")
-            content = self._embed_images(content)
-            
-            # Add to cache (at end for LRU)
-            self._chapter_cache[index] = content
-            
-            # Evict old entries if cache is too large
-            while len(self._chapter_cache) > self.MAX_CACHE_SIZE:
-                self._chapter_cache.popitem(last=False)  # Remove oldest (first) item
-            
+            # Disk cache only stores the normal (images shown) rendering
+            if self._show_images and index in self._disk_chapters:
+                content = self._disk_chapters[index].encode("utf-8")
+            else:
+                content = _to_utf8(self._zip.read(self._chapters[index]))
+                # Fast path: text-only chapters skip the full regex scan
+                # (probe is case-insensitive to mirror _IMG_RE)
+                if _IMG_PROBE_RE.search(content):
+                    content = self._embed_images(content)
+                if self._show_images:
+                    with self._cache_lock:
+                        self._disk_chapters[index] = content.decode("utf-8", "replace")
+                        self._disk_cache_dirty = True
+
+            with self._cache_lock:
+                # A preload worker may have raced us here; first insert wins
+                # so the byte accounting stays consistent
+                if index not in self._chapter_cache:
+                    # Add to cache (at end for LRU)
+                    self._chapter_cache[index] = content
+                    self._cache_bytes += len(content)
+
+                    # Evict oldest entries while over the byte budget (keep at least one)
+                    while self._cache_bytes > self.CACHE_BYTES and len(self._chapter_cache) > 1:
+                        _, evicted = self._chapter_cache.popitem(last=False)
+                        self._cache_bytes -= len(evicted)
+
             return content
         except Exception:
             return None
@@ -137,144 +358,246 @@ class EpubLoader:
         """Asynchronously preload adjacent chapters (optimised to avoid redundant work)"""
         # Only preload chapters that aren't already cached
         preload_range = range(max(0, current - 1), min(len(self._chapters), current + 2))
-        
+
         for i in preload_range:
             if i not in self._chapter_cache and i != current:
                 self._executor.submit(self.get_chapter_content, i)
 
-    # Pre-compiled regex pattern for better performance
-    _IMG_PATTERN = re.compile(r'<img[^>]+src=["\']([^"\'>]+)["\'][^>]*>', re.IGNORECASE)
+    def _embed_images(self, html: bytes) -> bytes:
+        """Convert image references to base64 inline (operates on bytes)"""
+        if self._show_images:
+            # Pre-encode unique, not-yet-cached images in parallel so the
+            # substitution callback below only does dict lookups
+            pending = []
+            for src in set(_IMG_RE.findall(html)):
+                path = self._resolve_image_path(src)
+                if path and path not in self._data_uri_cache:
+                    pending.append(path)
+            if len(pending) > 1:
+                futures = [
+                    self._encode_executor.submit(self._encode_image, p)
+                    for p in pending
+                ]
+                for future in futures:
+                    future.result()
+            elif pending:
+                self._encode_image(pending[0])
+
+        return _IMG_RE.sub(self._replace_image, html)
 
-    def _embed_images(self, html: str) -> str:
-        """Convert image references to base64 inline"""
-        if not self._book:
-            return html
+    def _resolve_image_path(self, src: bytes) -> Optional[str]:
+        """Resolve an <img> src attribute to its zip path (or None)"""
+        try:
+            key = _last_path(src.decode("utf-8", "replace"))
+            if '?' in key:
+                key = key[:key.find('?')]
+            return self._image_index.get(key)
+        except Exception:
+            return None
 
-        return self._IMG_PATTERN.sub(self._replace_image, html)
+    def _encode_image(self, path: str) -> Optional[bytes]:
+        """Encode an image into a data URI, at most once per book"""
+        try:
+            data_uri = self._data_uri_cache.get(path)
+            if data_uri is None and self._zip:
+                data = self._zip.read(path)
+                ext = path.lower().split(".")[-1]
+                mime_type = self._MIME_TYPES.get(ext, "image/jpeg")
+                data_uri = (
+                    b"data:" + mime_type.encode("ascii")
+                    + b";base64," + base64.b64encode(data)
+                )
+                self._data_uri_cache[path] = data_uri
+            return data_uri
+        except Exception:
+            return None
 
-    def _replace_image(self, match: re.Match) -> str:
+    def _replace_image(self, match: "re.Match[bytes]") -> bytes:
         """Replace a single image tag"""
         tag, src = match.group(0), match.group(1)
 
         # Show placeholder when images are hidden
         if not self._show_images:
-            filename = os.path.basename(unquote(src))
+            filename = _last_path(src.decode("utf-8", "replace"))
             return (
                 f'<div style="border:1px dashed #999;padding:10px;'
                 f'margin:10px 0;text-align:center;color:#666;">'
                 f"[图片: {filename}]</div>"
-            )
+            ).encode("utf-8")
 
-        try:
-            src_decoded = unquote(src)
-            item = self._image_index.get(src_decoded) or self._image_index.get(
-                src_decoded.split("/")[-1]
-            )
-
-            if item:
-                data = item.get_content()
-                ext = item.get_name().lower().split(".")[-1]
-                mime_type = self._MIME_TYPES.get(ext, "image/jpeg")
-                b64 = base64.b64encode(data).decode("utf-8")
-                return re.sub(
-                    r'src=["\'][^"\'>]+["\']',
-                    f'src="data:{mime_type};base64,{b64}"',
-                    tag,
-                    flags=re.IGNORECASE,
-                )
-        except Exception:
-            pass
+        path = self._resolve_image_path(src)
+        if path:
+            data_uri = self._encode_image(path)
+            if data_uri is not None:
+                # Splice the data URI over the src group using match offsets
+                # (no second scan of the tag)
+                start = match.start(1) - match.start(0)
+                end = match.end(1) - match.start(0)
+                return tag[:start] + data_uri + tag[end:]
         return tag
 
     def get_flat_toc(self) -> list:
-        """Get a flattened TOC list. Each item is a dict with title, chapter index and level"""
-        if not self._book:
+        """Get the flattened TOC list (computed once per book).
+
+        Each item is a dict with title, chapter index and level.
+        """
+        if self._flat_toc is None:
+            self._flat_toc = self._compute_flat_toc()
+        return self._flat_toc
+
+    def _compute_flat_toc(self) -> list:
+        """Parse the nav document (EPUB 3) or NCX (EPUB 2) into a flat list"""
+        if not self._zip:
             return []
-        
-        flat_toc = []
-        
-        def process_items(items, level=0):
-            for item in items:
-                if hasattr(item, '__iter__') and not isinstance(item, (str, bytes)):
-                    # This is an iterable (tuple/list), may be a nested structure
-                    process_items(item, level)
-                else:
-                    # Try to obtain title and href in a type-safe way
-                    title = None
-                    href = None
-
-                    # Skip plain strings/bytes early to satisfy static checkers
-                    if isinstance(item, (str, bytes)):
-                        continue
-
-                    if isinstance(item, epub.Link):
-                        # Common case: epub.Link
-                        title = item.title
-                        href = item.href
-                    elif isinstance(item, dict):
-                        # Some TOC entries can be dict-like
-                        title = item.get('title', '') or None
-                        href = item.get('href', '') or None
-                    else:
-                        # Fallback to attribute access for other objects
-                        title = getattr(item, 'title', None)
-                        href = getattr(item, 'href', None)
-                    
-                    if title:
-                        # Find corresponding chapter index
-                        chapter_idx = self._find_chapter_index(href) if href else None
-                        flat_toc.append({
-                            'title': title,
-                            'level': level,
-                            'href': href,
-                            'chapter_idx': chapter_idx
-                        })
-        
+
+        flat_toc: list = []
         try:
-            process_items(self._book.toc)
+            if self._toc_entry:
+                kind, path = self._toc_entry
+                root = ET.fromstring(self._zip.read(path))
+                if kind == "nav":
+                    self._walk_nav(root, flat_toc)
+                else:
+                    self._walk_ncx(root, flat_toc)
         except Exception as e:
             print(f"Error parsing TOC: {e}")
+            flat_toc = []
+
+        if not flat_toc:
             # Fallback: return a basic list based on chapter filenames
-            for i in range(self.chapter_count()):
-                filename = self._chapters[i].get_name()
+            for i, name in enumerate(self._chapters):
                 flat_toc.append({
-                    'title': f"章节 {i+1} ({os.path.basename(filename)})",
+                    'title': f"章节 {i+1} ({posixpath.basename(name)})",
                     'level': 0,
-                    'href': filename,
+                    'href': name,
                     'chapter_idx': i
                 })
-        
+
         return flat_toc
-    
+
+    def _walk_nav(self, root: ET.Element, flat_toc: list) -> None:
+        """Flatten the EPUB 3 nav document's toc <ol> tree"""
+        epub_type = "{http://www.idpf.org/2007/ops}type"
+        toc_nav = None
+        for elem in root.iter():
+            if _local(elem.tag) == "nav":
+                if toc_nav is None or elem.get(epub_type) == "toc":
+                    toc_nav = elem
+                if elem.get(epub_type) == "toc":
+                    break
+        if toc_nav is None:
+            return
+
+        def walk(elem: ET.Element, level: int) -> None:
+            for child in elem:
+                tag = _local(child.tag)
+                if tag == "li":
+                    anchor = next(
+                        (e for e in child if _local(e.tag) == "a"), None
+                    )
+                    if anchor is not None:
+                        title = "".join(anchor.itertext()).strip()
+                        href = anchor.get("href")
+                        if title:
+                            flat_toc.append({
+                                'title': title,
+                                'level': level,
+                                'href': href,
+                                'chapter_idx': self._find_chapter_index(href) if href else None
+                            })
+                    # Nested lists inside this entry
+                    for sub in child:
+                        if _local(sub.tag) == "ol":
+                            walk(sub, level + 1)
+                elif tag == "ol":
+                    walk(child, level)
+
+        walk(toc_nav, 0)
+
+    def _walk_ncx(self, root: ET.Element, flat_toc: list) -> None:
+        """Flatten the EPUB 2 NCX navMap"""
+
+        def walk(elem: ET.Element, level: int) -> None:
+            for child in elem:
+                if _local(child.tag) != "navPoint":
+                    continue
+                title = None
+                href = None
+                for sub in child:
+                    tag = _local(sub.tag)
+                    if tag == "navLabel":
+                        title = "".join(sub.itertext()).strip()
+                    elif tag == "content":
+                        href = sub.get("src")
+                if title:
+                    flat_toc.append({
+                        'title': title,
+                        'level': level,
+                        'href': href,
+                        'chapter_idx': self._find_chapter_index(href) if href else None
+                    })
+                walk(child, level + 1)
+
+        for elem in root.iter():
+            if _local(elem.tag) == "navMap":
+                walk(elem, 0)
+                break
+
     def _find_chapter_index(self, href: str) -> Optional[int]:
-        """Find chapter index by href"""
+        """Find chapter index by href (memoized per book)"""
         if not href:
             return None
-            
+
+        if href in self._href_idx_cache:
+            return self._href_idx_cache[href]
+
         # Extract filename part and remove anchor/query
-        filename = os.path.basename(unquote(href))
-        
+        filename = _last_path(href)
+
         # Remove anchor (#...) and query (?) parameters
         if '#' in filename:
-            filename = filename.split('#')[0]
+            filename = filename[:filename.find('#')]
         if '?' in filename:
-            filename = filename.split('?')[0]
-        
+            filename = filename[:filename.find('?')]
+
         # Direct lookup
-        if filename in self._chapter_map:
-            return self._chapter_map[filename]
-        
-        # Try searching chapters containing the filename
-        for chapter_idx, chapter in enumerate(self._chapters):
-            if filename in chapter.get_name():
-                return chapter_idx
-        
-        return None
+        result = self._chapter_map.get(filename)
+        if result is None:
+            # Try searching chapter names containing the filename
+            for chapter_idx, name in enumerate(self._chapters):
+                if filename in name:
+                    result = chapter_idx
+                    break
+
+        self._href_idx_cache[href] = result
+        return result
 
     def chapter_count(self) -> int:
         """Return the number of chapters"""
         return len(self._chapters)
 
-    def __del__(self):
-        """Shutdown the thread pool"""
+    def close(self) -> None:
+        """Release thread pools, caches and the open archive deterministically"""
+        self._flush_disk_cache()
         self._executor.shutdown(wait=False)
+        self._encode_executor.shutdown(wait=False)
+        self._chapter_cache.clear()
+        self._cache_bytes = 0
+        self._image_index.clear()
+        self._data_uri_cache.clear()
+        if self._zip:
+            self._zip.close()
+            self._zip = None
+
+    def __enter__(self) -> "EpubLoader":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def __del__(self):
+        """Safety net only - callers should use close()"""
+        try:
+            self.close()
+        except Exception:
+            pass
@@ -13,25 +13,34 @@ class SettingsManager:
 
     def __init__(self, filename: Optional[str] = None):
         self._settings_file = str(Path.home() / (filename or self.DEFAULT_FILE))
+        # In-memory copy; the file is read at most once
+        self._cache: Optional[Dict[str, Any]] = None
 
     def save(self, data: Dict[str, Any]) -> bool:
-        """Save settings to file"""
+        """Save settings to file (atomic replace)"""
         try:
-            with open(self._settings_file, "w", encoding="utf-8") as f:
+            tmp_file = self._settings_file + ".tmp"
+            with open(tmp_file, "w", encoding="utf-8") as f:
                 json.dump(data, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_file, self._settings_file)
+            self._cache = data
             return True
         except Exception:
             return False
 
     def load(self) -> Dict[str, Any]:
-        """Load settings from file"""
+        """Load settings (from memory after the first read)"""
+        if self._cache is not None:
+            return self._cache
         try:
             if os.path.exists(self._settings_file):
                 with open(self._settings_file, "r", encoding="utf-8") as f:
-                    return json.load(f)
+                    self._cache = json.load(f)
+                    return self._cache
         except Exception:
             pass
-        return {}
+        self._cache = {}
+        return self._cache
 
     def get(self, key: str, default: Any = None) -> Any:
         """Get a single setting"""
@@ -1,5 +1,7 @@
 """Theme configuration and stylesheet generation utilities."""
 
+import sys
+from string import Template
 from typing import Dict
 
 # Theme definitions (extensible color config dict)
@@ -246,369 +248,450 @@ THEMES: Dict[str, dict] = {
     },
 }
 
+# Intern the palette strings: many values repeat across themes ("#f8f8f2",
+# "rgba(0,0,0,0.3)", ...), so sharing one object per distinct string trims
+# memory and lets memo-key comparisons short-circuit on identity
+for _palette in THEMES.values():
+    for _key, _value in _palette.items():
+        if isinstance(_value, str):
+            _palette[_key] = sys.intern(_value)
+del _palette, _key, _value
 
-def get_stylesheet(colors: dict) -> str:
-    """Generate a modern Qt stylesheet"""
-    return f"""
+
+# Generated stylesheets memoized by palette contents (12 themes -> 12 entries)
+_QSS_CACHE: Dict[tuple, str] = {}
+
+# Identity fast path: the THEMES dicts are module-level singletons, so their
+# id() is stable and a plain int lookup skips building the sorted-items key.
+# Only the built-in palettes are keyed here (populated by the priming loop
+# below) — arbitrary caller dicts fall through to the content-keyed cache.
+_QSS_BY_ID: Dict[int, str] = {}
+
+# QSS template compiled once at import; substitution is a single C-level pass
+_QSS_TEMPLATE = Template("""
         /* ========== Main window ========== */
-        QMainWindow {{
-            background-color: {colors['bg']};
-            color: {colors['fg']};
-        }}
+        QMainWindow {
+            background-color: ${bg};
+            color: ${fg};
+        }
         
         /* ========== Toolbar ========== */
-        QToolBar {{
-            background-color: {colors['toolbar_bg']};
+        QToolBar {
+            background-color: ${toolbar_bg};
             border: none;
-            border-bottom: 1px solid {colors['toolbar_border']};
+            border-bottom: 1px solid ${toolbar_border};
             padding: 2px 4px;
             spacing: 2px;
-        }}
-        QToolBar::separator {{
-            background-color: {colors['border_color']};
+        }
+        QToolBar::separator {
+            background-color: ${border_color};
             width: 1px;
             margin: 4px 4px;
-        }}
-        QToolBar QToolButton {{
+        }
+        QToolBar QToolButton {
             background-color: transparent;
-            color: {colors['fg']};
+            color: ${fg};
             border: none;
             border-radius: 4px;
             padding: 4px 6px;
             min-width: 24px;
-        }}
-        QToolBar QToolButton:hover {{
-            background-color: {colors['hover_bg']};
-            color: {colors['hover_fg']};
-        }}
-        QToolBar QToolButton:pressed {{
-            background-color: {colors['select_bg']};
-            color: {colors['select_fg']};
-        }}
-        QToolBar QToolButton:checked {{
-            background-color: {colors['select_bg']};
-            color: {colors['select_fg']};
-        }}
-        QToolBar QLabel {{
-            color: {colors['fg']};
+        }
+        QToolBar QToolButton:hover {
+            background-color: ${hover_bg};
+            color: ${hover_fg};
+        }
+        QToolBar QToolButton:pressed {
+            background-color: ${select_bg};
+            color: ${select_fg};
+        }
+        QToolBar QToolButton:checked {
+            background-color: ${select_bg};
+            color: ${select_fg};
+        }
+        QToolBar QLabel {
+            color: ${fg};
             padding: 0 4px;
             opacity: 0.7;
-        }}
+        }
         
         /* ========== Treeview ========== */
-        QTreeWidget {{
-            background-color: {colors['treeview_bg']};
-            color: {colors['treeview_fg']};
+        QTreeWidget {
+            background-color: ${treeview_bg};
+            color: ${treeview_fg};
             border: none;
-            border-right: 1px solid {colors['border_color']};
+            border-right: 1px solid ${border_color};
             outline: none;
             padding: 4px;
-        }}
-        QTreeWidget::item {{
+        }
+        QTreeWidget::item {
             padding: 4px 8px;
             border-radius: 3px;
             margin: 1px 2px;
-        }}
-        QTreeWidget::item:selected {{
-            background-color: {colors['select_bg']};
-            color: {colors['select_fg']};
-        }}
-        QTreeWidget::item:hover:!selected {{
-            background-color: {colors['hover_bg']};
-            color: {colors['hover_fg']};
-        }}
-        QTreeWidget::branch {{
+        }
+        QTreeWidget::item:selected {
+            background-color: ${select_bg};
+            color: ${select_fg};
+        }
+        QTreeWidget::item:hover:!selected {
+            background-color: ${hover_bg};
+            color: ${hover_fg};
+        }
+        QTreeWidget::branch {
             background-color: transparent;
-        }}
+        }
         
         /* ========== Scrollbar ========== */
-        QScrollBar:vertical {{
+        QScrollBar:vertical {
             background-color: transparent;
             width: 10px;
             border: none;
             margin: 0;
-        }}
-        QScrollBar::handle:vertical {{
-            background-color: {colors['accent']};
+        }
+        QScrollBar::handle:vertical {
+            background-color: ${accent};
             min-height: 28px;
             border-radius: 6px;
             margin: 4px;
-            border: 2px solid {colors['treeview_bg']};
-        }}
-        QScrollBar::handle:vertical:hover {{
-            background-color: {colors['select_bg']};
-            border-color: {colors['accent']};
-        }}
-        QScrollBar::sub-page:vertical, QScrollBar::add-page:vertical {{
+            border: 2px solid ${treeview_bg};
+        }
+        QScrollBar::handle:vertical:hover {
+            background-color: ${select_bg};
+            border-color: ${accent};
+        }
+        QScrollBar::sub-page:vertical, QScrollBar::add-page:vertical {
             background: rgba(0,0,0,0); /* transparent */
-        }}
-        QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {{
+        }
+        QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
             height: 0px;
-        }}
-        QScrollBar:horizontal {{
+        }
+        QScrollBar:horizontal {
             background-color: transparent;
             height: 10px;
             border: none;
-        }}
-        QScrollBar::handle:horizontal {{
-            background-color: {colors['accent']};
+        }
+        QScrollBar::handle:horizontal {
+            background-color: ${accent};
             min-width: 28px;
             border-radius: 6px;
             margin: 4px;
-            border: 2px solid {colors['treeview_bg']};
-        }}
-        QScrollBar::handle:horizontal:hover {{
-            background-color: {colors['select_bg']};
-            border-color: {colors['accent']};
-        }}
-        QScrollBar::add-line:horizontal, QScrollBar::sub-line:horizontal {{
+            border: 2px solid ${treeview_bg};
+        }
+        QScrollBar::handle:horizontal:hover {
+            background-color: ${select_bg};
+            border-color: ${accent};
+        }
+        QScrollBar::add-line:horizontal, QScrollBar::sub-line:horizontal {
             width: 0px;
-        }}
+        }
         
         /* ========== Menu ========== */
-        QMenu {{
-            background-color: {colors['toolbar_bg']};
-            color: {colors['fg']};
-            border: 1px solid {colors['border_color']};
+        QMenu {
+            background-color: ${toolbar_bg};
+            color: ${fg};
+            border: 1px solid ${border_color};
             border-radius: 8px;
             padding: 8px 4px;
-        }}
-        QMenu::item {{
+        }
+        QMenu::item {
             padding: 8px 32px 8px 16px;
             border-radius: 4px;
             margin: 2px 4px;
-        }}
-        QMenu::item:selected {{
-            background-color: {colors['hover_bg']};
-            color: {colors['hover_fg']};
-        }}
-        QMenu::separator {{
+        }
+        QMenu::item:selected {
+            background-color: ${hover_bg};
+            color: ${hover_fg};
+        }
+        QMenu::separator {
             height: 1px;
-            background-color: {colors['border_color']};
+            background-color: ${border_color};
             margin: 6px 12px;
-        }}
+        }
         
         /* ========== Status bar ========== */
-        QStatusBar {{
-            background-color: {colors['toolbar_bg']};
-            color: {colors['fg']};
-            border-top: 1px solid {colors['toolbar_border']};
+        QStatusBar {
+            background-color: ${toolbar_bg};
+            color: ${fg};
+            border-top: 1px solid ${toolbar_border};
             padding: 4px 12px;
-        }}
-        QStatusBar QLabel {{
-            color: {colors['fg']};
+        }
+        QStatusBar QLabel {
+            color: ${fg};
             padding: 0 8px;
-        }}
+        }
         
         /* ========== Splitter ========== */
-        QSplitter::handle {{
-            background-color: {colors['border_color']};
+        QSplitter::handle {
+            background-color: ${border_color};
             width: 1px;
-        }}
-        QSplitter::handle:hover {{
-            background-color: {colors['accent']};
-        }}
+        }
+        QSplitter::handle:hover {
+            background-color: ${accent};
+        }
         
         /* ========== Dialog ========== */
-        QDialog {{
-            background-color: {colors['bg']};
-            color: {colors['fg']};
-        }}
+        QDialog {
+            background-color: ${bg};
+            color: ${fg};
+        }
         
         /* ========== Input ========== */
-        QLineEdit {{
-            background-color: {colors['treeview_bg']};
-            color: {colors['treeview_fg']};
-            border: 1px solid {colors['border_color']};
+        QLineEdit {
+            background-color: ${treeview_bg};
+            color: ${treeview_fg};
+            border: 1px solid ${border_color};
             border-radius: 6px;
             padding: 8px 12px;
-            selection-background-color: {colors['select_bg']};
-        }}
-        QLineEdit:focus {{
-            border-color: {colors['accent']};
-        }}
+            selection-background-color: ${select_bg};
+        }
+        QLineEdit:focus {
+            border-color: ${accent};
+        }
         
         /* ========== List ========== */
-        QListWidget {{
-            background-color: {colors['treeview_bg']};
-            color: {colors['treeview_fg']};
-            border: 1px solid {colors['border_color']};
+        QListWidget {
+            background-color: ${treeview_bg};
+            color: ${treeview_fg};
+            border: 1px solid ${border_color};
             border-radius: 6px;
             outline: none;
             padding: 4px;
-        }}
-        QListWidget::item {{
+        }
+        QListWidget::item {
             padding: 8px 12px;
             border-radius: 4px;
             margin: 2px;
-        }}
-        QListWidget::item:selected {{
-            background-color: {colors['select_bg']};
-            color: {colors['select_fg']};
-        }}
-        QListWidget::item:hover:!selected {{
-            background-color: {colors['hover_bg']};
-        }}
+        }
+        QListWidget::item:selected {
+            background-color: ${select_bg};
+            color: ${select_fg};
+        }
+        QListWidget::item:hover:!selected {
+            background-color: ${hover_bg};
+        }
         
         /* ========== Buttons ========== */
-        QPushButton {{
-            background-color: {colors['toolbar_bg']};
-            color: {colors['fg']};
-            border: 1px solid {colors['border_color']};
+        QPushButton {
+            background-color: ${toolbar_bg};
+            color: ${fg};
+            border: 1px solid ${border_color};
             border-radius: 6px;
             padding: 8px 20px;
             min-width: 80px;
-        }}
-        QPushButton:hover {{
-            background-color: {colors['hover_bg']};
-            border-color: {colors['accent']};
-        }}
-        QPushButton:pressed {{
-            background-color: {colors['select_bg']};
-            color: {colors['select_fg']};
-        }}
-        QPushButton:default {{
-            background-color: {colors['accent']};
-            color: {colors['select_fg']};
-            border-color: {colors['accent']};
-        }}
-        QPushButton:default:hover {{
-            background-color: {colors['select_bg']};
-        }}
+        }
+        QPushButton:hover {
+            background-color: ${hover_bg};
+            border-color: ${accent};
+        }
+        QPushButton:pressed {
+            background-color: ${select_bg};
+            color: ${select_fg};
+        }
+        QPushButton:default {
+            background-color: ${accent};
+            color: ${select_fg};
+            border-color: ${accent};
+        }
+        QPushButton:default:hover {
+            background-color: ${select_bg};
+        }
         
         /* ========== Dialog buttons ========== */
-        QDialogButtonBox QPushButton {{
+        QDialogButtonBox QPushButton {
             min-width: 90px;
-        }}
+        }
         
         /* ========== Labels ========== */
-        QLabel {{
-            color: {colors['fg']};
-        }}
+        QLabel {
+            color: ${fg};
+        }
         
         /* ========== Common component background ========== */
-        QWidget {{
-            background-color: {colors['bg']};
-            color: {colors['fg']};
-        }}
-    """
+        QWidget {
+            background-color: ${bg};
+            color: ${fg};
+        }
+    """)
 
+# Document scaffolding around the chapter CSS; the style element carries a
+# stable id so the UI can swap its textContent in place on theme changes
+# instead of reloading the whole document
+_HTML_PREFIX = '<!DOCTYPE html>\n<html><head><meta charset="utf-8"><style id="reader-style">'
+_HTML_SUFFIX = "</style></head><body>"
 
-def generate_html_style(
-    colors: dict,
-    font_family: str,
-    font_size: int,
-    line_spacing: float,
-    paragraph_spacing: float,
-) -> str:
-    """Generate HTML content styles"""
-    return f"""<!DOCTYPE html>
-<html><head><meta charset="utf-8"><style>
-* {{
+# Chapter CSS template compiled once at import
+_HTML_CSS_TEMPLATE = Template(""":root {
+    /* Mutable reading settings live in CSS variables so font/spacing
+       changes can be applied to the live page without a full re-render */
+    --font-family: "${font_family}";
+    --font-size: ${font_size}px;
+    --line-spacing: ${line_spacing};
+    --para-spacing: ${paragraph_spacing}em;
+}
+* {
     box-sizing: border-box;
-}}
-body {{
-    font-family: "{font_family}", "Microsoft YaHei", "PingFang SC", sans-serif;
-    line-height: {line_spacing};
+}
+body {
+    font-family: var(--font-family), "Microsoft YaHei", "PingFang SC", sans-serif;
+    line-height: var(--line-spacing);
     margin: 0;
     padding: 16px 24px;
-    background-color: {colors['content_bg']};
-    color: {colors['content_fg']};
-    font-size: {font_size}px;
-}}
-h1, h2, h3, h4, h5, h6 {{
-    color: {colors['heading_color']};
+    background-color: ${content_bg};
+    color: ${content_fg};
+    font-size: var(--font-size);
+}
+h1, h2, h3, h4, h5, h6 {
+    color: ${heading_color};
     margin-top: 1.5em;
     margin-bottom: 0.8em;
     font-weight: 600;
-}}
-h1 {{ font-size: 1.8em; border-bottom: 2px solid {colors['border_color']}; padding-bottom: 0.3em; }}
-h2 {{ font-size: 1.5em; }}
-h3 {{ font-size: 1.3em; }}
-p {{
+}
+h1 { font-size: 1.8em; border-bottom: 2px solid ${border_color}; padding-bottom: 0.3em; }
+h2 { font-size: 1.5em; }
+h3 { font-size: 1.3em; }
+p {
     text-indent: 2em;
-    margin: {paragraph_spacing}em 0;
+    margin: var(--para-spacing) 0;
     text-align: justify;
-}}
-a {{
-    color: {colors['link_color']};
+}
+a {
+    color: ${link_color};
     text-decoration: none;
-}}
-a:hover {{
+}
+a:hover {
     text-decoration: underline;
-}}
-img {{
+}
+img {
     max-width: 100%;
     height: auto;
     display: block;
     margin: 1.5em auto;
     border-radius: 8px;
-    box-shadow: 0 4px 12px {colors.get('shadow', 'rgba(0,0,0,0.1)')};
-}}
-blockquote {{
-    border-left: 4px solid {colors['accent']};
+    box-shadow: 0 4px 12px ${shadow};
+}
+blockquote {
+    border-left: 4px solid ${accent};
     margin: 1.5em 0;
     padding: 0.5em 1.5em;
-    background-color: {colors['hover_bg']};
+    background-color: ${hover_bg};
     border-radius: 0 8px 8px 0;
-}}
+}
 /* ========== Web content scrollbar (WebKit) ========== */
-::-webkit-scrollbar {{
+::-webkit-scrollbar {
     width: 10px;
     height: 10px;
-}}
-::-webkit-scrollbar-track {{
-    background: {colors['content_bg']};
+}
+::-webkit-scrollbar-track {
+    background: ${content_bg};
     border-radius: 6px;
-}}
-::-webkit-scrollbar-thumb {{
-    background: {colors['accent']};
+}
+::-webkit-scrollbar-thumb {
+    background: ${accent};
     border-radius: 6px;
-    border: 2px solid {colors['content_bg']};
-}}
-::-webkit-scrollbar-thumb:hover {{
-    background: {colors['select_bg']};
-}}
-code {{
-    background-color: {colors['hover_bg']};
+    border: 2px solid ${content_bg};
+}
+::-webkit-scrollbar-thumb:hover {
+    background: ${select_bg};
+}
+code {
+    background-color: ${hover_bg};
     padding: 2px 6px;
     border-radius: 4px;
     font-family: "Consolas", "Monaco", monospace;
     font-size: 0.9em;
-}}
-pre {{
-    background-color: {colors['toolbar_bg']};
+}
+pre {
+    background-color: ${toolbar_bg};
     padding: 16px;
     border-radius: 8px;
     overflow-x: auto;
-    border: 1px solid {colors['border_color']};
-}}
-pre code {{
+    border: 1px solid ${border_color};
+}
+pre code {
     background: none;
     padding: 0;
-}}
-hr {{
+}
+hr {
     border: none;
     height: 1px;
-    background: linear-gradient(to right, transparent, {colors['border_color']}, transparent);
+    background: linear-gradient(to right, transparent, ${border_color}, transparent);
     margin: 2em 0;
-}}
-table {{
+}
+table {
     border-collapse: collapse;
     width: 100%;
     margin: 1.5em 0;
-}}
-th, td {{
-    border: 1px solid {colors['border_color']};
+}
+th, td {
+    border: 1px solid ${border_color};
     padding: 10px 14px;
     text-align: left;
-}}
-th {{
-    background-color: {colors['hover_bg']};
+}
+th {
+    background-color: ${hover_bg};
     font-weight: 600;
-}}
-::selection {{
-    background-color: {colors['select_bg']};
-    color: {colors['select_fg']};
-}}
-</style></head><body>"""
+}
+::selection {
+    background-color: ${select_bg};
+    color: ${select_fg};
+}
+""")
+
+
+def get_stylesheet(colors: dict) -> str:
+    """Generate a modern Qt stylesheet (memoized per palette)"""
+    cached = _QSS_BY_ID.get(id(colors))
+    if cached is not None:
+        return cached
+    key = tuple(sorted(colors.items()))
+    cached = _QSS_CACHE.get(key)
+    if cached is not None:
+        return cached
+    result = _build_stylesheet(colors)
+    _QSS_CACHE[key] = result
+    return result
+
+
+def _build_stylesheet(colors: dict) -> str:
+    return _QSS_TEMPLATE.substitute(colors)
+
+
+def generate_html_css(
+    colors: dict,
+    font_family: str,
+    font_size: int,
+    line_spacing: float,
+    paragraph_spacing: float,
+) -> str:
+    """Generate the chapter CSS alone (for in-place style swaps)"""
+    return _HTML_CSS_TEMPLATE.substitute(
+        colors,
+        font_family=font_family,
+        font_size=font_size,
+        line_spacing=line_spacing,
+        paragraph_spacing=paragraph_spacing,
+        shadow=colors.get("shadow", "rgba(0,0,0,0.1)"),
+    )
+
+
+def generate_html_style(
+    colors: dict,
+    font_family: str,
+    font_size: int,
+    line_spacing: float,
+    paragraph_spacing: float,
+) -> str:
+    """Generate HTML content styles"""
+    return (
+        _HTML_PREFIX
+        + generate_html_css(
+            colors, font_family, font_size, line_spacing, paragraph_spacing
+        )
+        + _HTML_SUFFIX
+    )
+
+
+# Prime the stylesheet caches for all built-in themes at import time so the
+# first apply of any theme is a plain dict lookup
+for _colors in THEMES.values():
+    _QSS_BY_ID[id(_colors)] = get_stylesheet(_colors)
+del _colors
@@ -2,6 +2,9 @@
 // Loads Qt WebChannel and forwards left/right mouse clicks to Python bridge
 
 document.addEventListener('DOMContentLoaded', function() {
+    // QWebChannel is injected alongside this script; bail out quietly if the
+    // bootstrap was unavailable so click handling degrades gracefully
+    if (typeof QWebChannel === 'undefined' || typeof qt === 'undefined') return;
     new QWebChannel(qt.webChannelTransport, function(channel) {
         window.bridge = channel.objects.bridge;
     });
@@ -9,6 +12,10 @@ document.addEventListener('DOMContentLoaded', function() {
 
 // Ignore clicks on the scrollbar area (prevent page turning when the scrollbar is clicked)
 document.addEventListener('mousedown', function(e) {
+    // Fast path: with reading mode off the Python side drops the click
+    // anyway, so skip the bridge IPC entirely. undefined means "not yet
+    // synced" and falls through to the Python-side guard.
+    if (window.__readingMode === false) return;
     try {
         var scrollbarWidth = window.innerWidth - (document.documentElement.clientWidth || document.body.clientWidth || 0);
         // If computed scrollbar width > 0 and click is within the scrollbar area on the right, ignore the event
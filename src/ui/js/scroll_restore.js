@@ -4,21 +4,53 @@
 
 function getScrollRatio() {
     try {
-        var h = document.documentElement.scrollHeight || document.body.scrollHeight;
-        var win = window.innerHeight || document.documentElement.clientHeight;
+        // Batch the DOM reads (single documentElement lookup, read-read-read,
+        // no interleaved writes) so the renderer computes layout at most once
+        var de = document.documentElement;
+        var h = de.scrollHeight || document.body.scrollHeight;
+        var win = window.innerHeight || de.clientHeight;
         var y = window.scrollY || window.pageYOffset || 0;
-        var ratio = (h - win > 0) ? (y / (h - win)) : 0;
-        return ratio;
+        return (h - win > 0) ? (y / (h - win)) : 0;
     } catch (e) {
         return 0;
     }
 }
 
+// restoreScrollRatio(ratio): apply the ratio now and retry shortly after,
+// so late layout (fonts, images) can't leave the page at a stale offset.
+// Returns nothing on purpose: callers fire-and-forget a single IPC call.
+function restoreScrollRatio(ratio) {
+    try {
+        setScrollRatio(ratio);
+        requestAnimationFrame(function () { setScrollRatio(ratio); });
+        setTimeout(function () { setScrollRatio(ratio); }, 60);
+    } catch (e) {
+        // ignore
+    }
+}
+
+// Push the scroll position to Python (passive, debounced) so chapter
+// re-renders can reuse the last known ratio without a round-trip read
+(function () {
+    var timer = null;
+    window.addEventListener('scroll', function () {
+        if (timer !== null) return;
+        timer = setTimeout(function () {
+            timer = null;
+            if (window.bridge && window.bridge.onScrollRatio) {
+                window.bridge.onScrollRatio(getScrollRatio());
+            }
+        }, 100);
+    }, { passive: true });
+})();
+
 function setScrollRatio(ratio) {
     try {
         ratio = Math.max(0, Math.min(1, Number(ratio) || 0));
-        var h = document.documentElement.scrollHeight || document.body.scrollHeight;
-        var win = window.innerHeight || document.documentElement.clientHeight;
+        // All reads before the scrollTo write to avoid forcing extra layouts
+        var de = document.documentElement;
+        var h = de.scrollHeight || document.body.scrollHeight;
+        var win = window.innerHeight || de.clientHeight;
         var y = 0;
         if (h - win > 0) y = Math.round(ratio * (h - win));
         window.scrollTo(0, y);
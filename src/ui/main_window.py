@@ -1,6 +1,9 @@
 """Main window (UI and interaction)"""
 
+import bisect
+import json
 import os
+from functools import partial
 from typing import Optional
 
 from PyQt6.QtWidgets import (
@@ -20,49 +23,120 @@ from PyQt6.QtWidgets import (
     QSizePolicy,
     QWidgetAction,
     QLineEdit,
-    QListWidget,
+    QListView,
+    QStyledItemDelegate,
 )
 from PyQt6.QtWebEngineWidgets import QWebEngineView
-from PyQt6.QtCore import Qt, QTimer, QSize
+from PyQt6.QtWebEngineCore import QWebEngineProfile, QWebEngineScript
+from PyQt6.QtCore import (
+    Qt,
+    QTimer,
+    QSize,
+    QByteArray,
+    QStringListModel,
+    QSortFilterProxyModel,
+    QThreadPool,
+    pyqtSignal,
+)
 from PyQt6.QtGui import QAction, QFont, QShortcut, QKeySequence, QFontDatabase
 from PyQt6.QtWebChannel import QWebChannel
 
 from src.core.epub_loader import EpubLoader
 from src.core.settings import SettingsManager
-from src.core.themes import THEMES, get_stylesheet, generate_html_style
+from src.core.themes import (
+    THEMES,
+    get_stylesheet,
+    generate_html_css,
+    generate_html_style,
+)
 from src.ui.web_bridge import WebBridge
 
 
-# JavaScript code: mouse click detection in reading mode (loaded from external file)
+# JavaScript code: mouse click detection in reading mode and scroll helpers
+# (loaded from external files, injected once per page via QWebEngineScript)
 def _load_js(name: str) -> str:
     try:
         base = os.path.join(os.path.dirname(__file__), "js")
         path = os.path.join(base, name)
         with open(path, "r", encoding="utf-8") as f:
-            content = f.read()
-            # Wrap the JS in <script> tags so it is interpreted by the browser,
-            # and include the qwebchannel loader script reference.
-            return (
-                '<script src="qrc:///qtwebchannel/qwebchannel.js"></script>\n'
-                '<script>\n'
-                f"{content}\n"
-                '</script>\n'
-            )
+            return f.read()
     except Exception:
         return ""
 
 _MOUSE_HANDLER_JS = _load_js("mouse_handler.js")
 _SCROLL_JS = _load_js("scroll_restore.js")
 
+def _strip_leading_emoji(name: str) -> str:
+    """Drop a leading emoji (plus optional space) from a theme display name"""
+    if name and ord(name[0]) > 255:
+        return name[2:] if len(name) > 2 and name[1] == " " else name[1:]
+    return name
+
+
+# Theme display names with any leading emoji stripped, computed once instead
+# of re-running the ord()/slice dance on every toolbar refresh
+_THEME_DISPLAY_NAMES = {
+    key: _strip_leading_emoji(info.get("name", key))
+    for key, info in THEMES.items()
+}
+
+
+# Installed font families (sorted, "@"-prefixed vertical variants dropped).
+# System font enumeration can take tens of ms and the result is stable for
+# the process lifetime, so cache it at module scope.
+_FONTS_CACHE: Optional[list] = None
+
+
+def _get_fonts() -> list:
+    global _FONTS_CACHE
+    if _FONTS_CACHE is None:
+        _FONTS_CACHE = sorted(
+            f for f in QFontDatabase.families() if not f.startswith("@")
+        )
+    return _FONTS_CACHE
+
+
+class _FontPreviewDelegate(QStyledItemDelegate):
+    """Renders each font-list row in its own family (QFonts built lazily)"""
+
+    _ROW_SIZE = QSize(360, 26)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._fonts: dict = {}
+
+    def initStyleOption(self, option, index):
+        super().initStyleOption(option, index)
+        name = index.data()
+        font = self._fonts.get(name)
+        if font is None:
+            font = QFont(name, 14)
+            self._fonts[name] = font
+        option.font = font
+
+    def sizeHint(self, option, index):
+        return self._ROW_SIZE
+
 
 class MainWindow(QMainWindow):
     """EPUB Reader main window - modern design"""
 
+    # Emitted from worker threads when a background chapter parse finishes;
+    # the queued connection delivers it on the UI thread
+    _chapter_ready = pyqtSignal(int)
+
     # Default settings
     DEFAULT_FONT = "Microsoft YaHei"
     DEFAULT_FONT_SIZE = 16
     DEFAULT_THEME = "light"
 
+    # Shared UI fonts: each QFont construction resolves the family through
+    # the platform font system, so build every variant once
+    TOC_HEADER_FONT = QFont(DEFAULT_FONT, 11, QFont.Weight.Bold)
+    TOC_TREE_FONT = QFont(DEFAULT_FONT, 10)
+    SMALL_FONT = QFont(DEFAULT_FONT, 9)
+    MENU_FONT = QFont(DEFAULT_FONT, 11)
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("EPUB 阅读器")
@@ -81,9 +155,23 @@ class MainWindow(QMainWindow):
         self._toolbar_items: list[tuple] = []  # (item, label)
         self._compact_threshold = 520
         self._compact_mode = False
+        # Set whenever theme/compact/reading state changes; lets
+        # _refresh_toolbar_items skip runs where nothing observable moved
+        self._toolbar_dirty = True
 
         # Display and typography settings
         self._current_theme = self.DEFAULT_THEME
+        # Resolved palette for the active theme; refreshed in _apply_theme so
+        # hot paths don't re-run the THEMES.get fallback dance
+        self._active_theme_colors: dict = THEMES[self.DEFAULT_THEME]
+        # Last theme actually pushed to setStyleSheet; lets _apply_theme skip
+        # the widget-tree re-polish when nothing changed
+        self._applied_theme: Optional[str] = None
+        # Compact QMenu stylesheet per theme key (see _menu_stylesheet)
+        self._menu_qss_cache: dict = {}
+        # Same idea for the font picker list (see _font_list_stylesheet)
+        self._font_list_qss_cache: dict = {}
+        self._font_list: Optional[QListView] = None
         self._font_family = self.DEFAULT_FONT
         self._font_size = self.DEFAULT_FONT_SIZE
         self._font_scale = 1.0
@@ -97,13 +185,56 @@ class MainWindow(QMainWindow):
         # Temporarily save scroll info to restore reading position after display changes (per-chapter)
         self._pending_scroll_ratio: Optional[float] = None
         self._pending_scroll_chapter: Optional[int] = None
+        # Continuously updated from the page's passive scroll listener via the
+        # web channel; re-renders read it instead of a blocking JS round-trip
+        self._current_scroll_ratio = 0.0
 
         # HTML style cache (to avoid regenerating on every chapter render)
         self._cached_html_style: Optional[str] = None
         self._cached_style_key: Optional[tuple] = None
-
-        # Font list cache (lazy loading)
-        self._all_fonts: Optional[list] = None
+        # Fully assembled document head (style + scripts) pre-encoded to UTF-8;
+        # per-chapter assembly is then head + body + closing tag
+        self._cached_head_bytes: Optional[bytes] = None
+
+        # Coalesce rapid re-render requests (zoom/spacing key auto-repeat)
+        # into a single setContent; the window is chosen per request kind
+        # in _display_chapter
+        self._pending_preserve = True
+        self._render_timer = QTimer(self)
+        self._render_timer.setSingleShot(True)
+        self._render_timer.timeout.connect(self._do_display_chapter)
+
+        # Window geometry re-encodes lazily: move/resize events mark it
+        # dirty and _do_save_settings refreshes the cached base64 string
+        self._geometry_dirty = True
+        self._geometry_b64: Optional[str] = None
+
+        # Coalesce settings writes: holding a zoom/spacing key otherwise
+        # rewrites the whole settings file once per auto-repeat event
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(500)
+        self._save_timer.timeout.connect(self._do_save_settings)
+
+        # Debounce resize-driven toolbar compact checks; border drags fire
+        # resizeEvent at the display refresh rate
+        self._resize_timer = QTimer(self)
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.setInterval(50)
+        self._resize_timer.timeout.connect(self._maybe_update_toolbar_compact)
+
+        # chapter_idx -> QTreeWidgetItem, rebuilt with the TOC tree; lets
+        # _update_toc_selection find the row without scanning every item
+        self._chapter_to_item: dict = {}
+        # Chapter whose TOC row is currently highlighted; lets
+        # _update_toc_selection no-op on settings-only re-renders
+        self._last_selected_toc: Optional[int] = None
+
+        # Cold chapters (fresh open, long jump) are parsed on a pool thread;
+        # _chapter_ready bounces completion back onto the UI thread
+        self._fetching_chapter: Optional[int] = None
+        self._failed_fetch: Optional[int] = None
+        self._chapter_ready.connect(self._on_chapter_ready)
 
         # UI component references (handles for later updates)
         self._reading_btn: Optional[QAction] = None
@@ -116,10 +247,15 @@ class MainWindow(QMainWindow):
         self._load_settings()
         self._apply_theme()
 
+        # Warm the font list off the UI thread so the first open of the font
+        # menu doesn't stall on system font enumeration; if the menu opens
+        # before the worker finishes, _get_fonts just enumerates synchronously
+        QThreadPool.globalInstance().start(_get_fonts)
+
         # Auto-open last file
         if self._last_opened and os.path.exists(self._last_opened):
             file_path = self._last_opened
-            QTimer.singleShot(100, lambda: self._open_file(file_path))
+            QTimer.singleShot(100, partial(self._open_file, file_path))
 
     # ==================== Properties ====================
 
@@ -131,6 +267,16 @@ class MainWindow(QMainWindow):
     def menu_open(self) -> bool:
         return self._menu_open
 
+    def update_scroll_ratio(self, ratio: float) -> None:
+        """Record the page scroll ratio pushed from JS (see scroll_restore.js)"""
+        try:
+            self._current_scroll_ratio = max(0.0, min(1.0, float(ratio)))
+        except Exception:
+            pass
+
+    def _on_menu_hidden(self) -> None:
+        self._menu_open = False
+
     # ==================== UI Initialization ====================
 
     def _setup_ui(self) -> None:
@@ -157,6 +303,26 @@ class MainWindow(QMainWindow):
         content_layout.setSpacing(0)
 
         self._browser = QWebEngineView()
+        # Make sure no inherited graphics effect stalls compositing
+        effect = self._browser.graphicsEffect()
+        if effect is not None:
+            effect.setEnabled(False)
+        # Persistent disk cache so decoded images survive the setContent
+        # calls between chapter flips
+        try:
+            from PyQt6.QtCore import QStandardPaths
+
+            profile = self._browser.page().profile()
+            profile.setHttpCacheType(
+                QWebEngineProfile.HttpCacheType.DiskHttpCache
+            )
+            cache_dir = QStandardPaths.writableLocation(
+                QStandardPaths.StandardLocation.CacheLocation
+            )
+            profile.setCachePath(os.path.join(cache_dir, "epubreader-pyqt"))
+            profile.setHttpCacheMaximumSize(200 * 1024 * 1024)
+        except Exception:
+            pass
         content_layout.addWidget(self._browser)
 
         self._splitter.addWidget(content_widget)
@@ -167,6 +333,13 @@ class MainWindow(QMainWindow):
         page = self._browser.page()
         assert page is not None
         page.setWebChannel(self._channel)
+        # Install the channel bootstrap and page helpers once on the page's
+        # script collection; they run at DocumentCreation for every chapter,
+        # so the HTML head no longer carries per-chapter <script> tags
+        self._install_page_scripts(page)
+        # Single permanent slot; per-render state travels through the
+        # _pending_scroll_* attributes instead of fresh closures
+        page.loadFinished.connect(self._on_page_loaded)
 
         self._splitter.setSizes([200, 1000])
         self._splitter.setStretchFactor(0, 0)
@@ -175,6 +348,35 @@ class MainWindow(QMainWindow):
         self._create_toolbar()
         self._create_status_bar()
 
+    def _install_page_scripts(self, page) -> None:
+        """Register qwebchannel.js plus our helpers as a DocumentCreation script"""
+        try:
+            from PyQt6.QtCore import QFile, QIODevice
+
+            qwebchannel_src = ""
+            qf = QFile(":/qtwebchannel/qwebchannel.js")
+            if qf.open(QIODevice.OpenModeFlag.ReadOnly):
+                qwebchannel_src = bytes(qf.readAll().data()).decode("utf-8")
+                qf.close()
+
+            script = QWebEngineScript()
+            script.setName("epubreader-bridge")
+            script.setSourceCode(
+                "\n".join(
+                    s
+                    for s in (qwebchannel_src, _MOUSE_HANDLER_JS, _SCROLL_JS)
+                    if s
+                )
+            )
+            script.setInjectionPoint(
+                QWebEngineScript.InjectionPoint.DocumentCreation
+            )
+            script.setWorldId(QWebEngineScript.ScriptWorldId.MainWorld)
+            script.setRunsOnSubFrames(False)
+            page.scripts().insert(script)
+        except Exception:
+            pass
+
     def _create_toc_panel(self) -> QWidget:
         """Create the table of contents panel"""
         panel = QWidget()
@@ -192,13 +394,13 @@ class MainWindow(QMainWindow):
         header_layout.setContentsMargins(8, 0, 8, 0)
 
         self._toc_header = QLabel("📚 目录")
-        self._toc_header.setFont(QFont(self.DEFAULT_FONT, 11, QFont.Weight.Bold))
+        self._toc_header.setFont(self.TOC_HEADER_FONT)
         header_layout.addWidget(self._toc_header)
 
         header_layout.addStretch()
 
         self._chapter_label = QLabel("")
-        self._chapter_label.setFont(QFont(self.DEFAULT_FONT, 9))
+        self._chapter_label.setFont(self.SMALL_FONT)
         self._chapter_label.setStyleSheet("opacity: 0.7;")
         header_layout.addWidget(self._chapter_label)
 
@@ -217,7 +419,7 @@ class MainWindow(QMainWindow):
         self._toc_tree.setAnimated(True)
         self._toc_tree.setExpandsOnDoubleClick(True)
         self._toc_tree.itemClicked.connect(self._on_toc_click)
-        self._toc_tree.setFont(QFont(self.DEFAULT_FONT, 10))
+        self._toc_tree.setFont(self.TOC_TREE_FONT)
         layout.addWidget(self._toc_tree)
 
         return panel
@@ -233,21 +435,23 @@ class MainWindow(QMainWindow):
 
         # File button - open directly
         self._add_action(
-            toolbar, "打开", "打开文件 (Ctrl+O)", self._open_file_dialog
+            toolbar, "打开", "打开文件 (Ctrl+O)", self._open_file_dialog, "Ctrl+O"
         )
 
         toolbar.addSeparator()
 
         # Navigation buttons group
-        self._add_action(toolbar, "上一章", "上一章 (←)", self.prev_chapter)
-        self._add_action(toolbar, "下一章", "下一章 (→)", self.next_chapter)
+        self._add_action(toolbar, "上一章", "上一章 (←)", self.prev_chapter, "Left")
+        self._add_action(toolbar, "下一章", "下一章 (→)", self.next_chapter, "Right")
 
         toolbar.addSeparator()
 
         # View buttons group
-        self._add_action(toolbar, "目录", "显示/隐藏目录 (Ctrl+T)", self._toggle_toc)
         self._add_action(
-            toolbar, "图片", "显示/隐藏图片 (Ctrl+I)", self._toggle_images
+            toolbar, "目录", "显示/隐藏目录 (Ctrl+T)", self._toggle_toc, "Ctrl+T"
+        )
+        self._add_action(
+            toolbar, "图片", "显示/隐藏图片 (Ctrl+I)", self._toggle_images, "Ctrl+I"
         )
 
         toolbar.addSeparator()
@@ -272,14 +476,24 @@ class MainWindow(QMainWindow):
 
         # Reading mode button (right side)
         self._reading_btn = self._add_action(
-            toolbar, "阅读模式", "切换阅读模式 (Ctrl+M)", self._toggle_reading_mode
+            toolbar, "阅读模式", "切换阅读模式 (Ctrl+M)", self._toggle_reading_mode,
+            "Ctrl+M",
         )
 
-    def _add_action(self, toolbar: QToolBar, label: str, tip: str, callback) -> QAction:
-        """Add a toolbar QAction. Returns QAction."""
+    def _add_action(
+        self,
+        toolbar: QToolBar,
+        label: str,
+        tip: str,
+        callback,
+        shortcut: Optional[str] = None,
+    ) -> QAction:
+        """Add a toolbar QAction (optionally carrying its shortcut). Returns QAction."""
         action = toolbar.addAction(label, callback)
         assert action is not None
         action.setToolTip(tip)
+        if shortcut:
+            action.setShortcut(QKeySequence(shortcut))
         # Save for display toggling (item, label)
         self._toolbar_items.append((action, label))
         return action
@@ -291,6 +505,7 @@ class MainWindow(QMainWindow):
         if want_compact == self._compact_mode:
             return
         self._compact_mode = want_compact
+        self._toolbar_dirty = True
         if want_compact:
             # Icon only
             self._toolbar.setToolButtonStyle(Qt.ToolButtonStyle.ToolButtonIconOnly)
@@ -302,31 +517,26 @@ class MainWindow(QMainWindow):
         # Refresh all labels; centralize text display management
         self._refresh_toolbar_labels()
 
-    def _safe(self, fn, *args, **kwargs):
-        """Safe call wrapper: catch exceptions and return None to simplify error handling."""
-        try:
-            return fn(*args, **kwargs)
-        except Exception:
-            return None
-
     def _refresh_toolbar_items(self) -> None:
         """Refresh toolbar labels (handle compact mode)."""
+        if not self._toolbar_dirty:
+            return
+        self._toolbar_dirty = False
+        # Every entry is a real QAction, so call setText directly; the
+        # compact-mode branch is hoisted out of the loop
+        if self._compact_mode:
+            for item, _label in self._toolbar_items:
+                item.setText("")
+            return
+        theme_action = getattr(self, "_theme_action", None)
         for item, label in self._toolbar_items:
-            # Text handling
-            if self._compact_mode:
-                self._safe(getattr(item, "setText", lambda *_: None), "")
+            if item is theme_action:
+                item.setText("主题")
+            elif item is self._reading_btn:
+                # Keep reading button label synchronized with reading state
+                item.setText("阅读中" if self._reading_mode else label)
             else:
-                if item is getattr(self, "_theme_action", None):
-                    self._safe(getattr(item, "setText", lambda *_: None), "主题")
-                elif item is getattr(self, "_reading_btn", None):
-                    # Keep reading button label synchronized with reading state
-                    self._safe(getattr(item, "setText", lambda *_: None), "阅读中" if self._reading_mode else label)
-                else:
-                    self._safe(getattr(item, "setText", lambda *_: None), label)
-        # Ensure format action text aligns with compact mode
-        fa = getattr(self, "_format_action", None)
-        if fa is not None:
-            self._safe(fa.setText, "排版" if not self._compact_mode else "")
+                item.setText(label)
 
     def _refresh_toolbar_labels(self) -> None:
         self._refresh_toolbar_items()
@@ -338,35 +548,34 @@ class MainWindow(QMainWindow):
 
         # Progress label
         self._progress_label = QLabel(" 0/0 ")
-        self._progress_label.setFont(QFont(self.DEFAULT_FONT, 9))
+        self._progress_label.setFont(self.SMALL_FONT)
         status_bar.addPermanentWidget(self._progress_label)
 
         status_bar.showMessage("欢迎使用 EPUB 阅读器")
-        # Initially update toolbar - combine multiple delayed refreshes into one
-        def _initial_refresh():
-            self._maybe_update_toolbar_compact()
-            self._refresh_toolbar_labels()
-        
-        QTimer.singleShot(250, _initial_refresh)
+        # Initial toolbar refresh happens via showEvent's delayed call; no
+        # second startup timer needed
 
     def _setup_shortcuts(self) -> None:
-        """Register global keyboard shortcuts."""
+        """Register keyboard shortcuts that have no toolbar counterpart.
+
+        Keys covered by a toolbar button (Ctrl+O, Left/Right, Ctrl+T, Ctrl+I,
+        Ctrl+M) live on the QActions themselves (see _add_action), so no
+        standalone QShortcut object is needed for them.
+        """
         shortcuts = [
-            ("Ctrl+O", self._open_file_dialog),
             ("Ctrl+R", self._reopen_last),
             ("Ctrl+Q", self.close),
-            ("Ctrl+T", self._toggle_toc),
-            ("Left", self.prev_chapter),
-            ("Right", self.next_chapter),
             ("Ctrl+=", self._zoom_in),
             ("Ctrl+-", self._zoom_out),
-            ("Ctrl+M", self._toggle_reading_mode),
-            ("Ctrl+I", self._toggle_images),
-            ("Home", lambda: self._goto_chapter(0)),
-            ("End", lambda: self._goto_chapter(self._loader.chapter_count() - 1)),
+            ("Home", partial(self._goto_chapter, 0)),
+            ("End", self._goto_last_chapter),
         ]
+        # Keep references so the QShortcut objects are not garbage collected
+        self._shortcuts = []
         for key, func in shortcuts:
-            QShortcut(QKeySequence(key), self).activated.connect(func)
+            sc = QShortcut(QKeySequence(key), self)
+            sc.activated.connect(func)
+            self._shortcuts.append(sc)
         # Toolbar display mode needs updating on window resize
         # Implemented by overriding resizeEvent
 
@@ -374,7 +583,13 @@ class MainWindow(QMainWindow):
 
     def _apply_theme(self) -> None:
         """Apply current theme to the application stylesheet and refresh the toolbar."""
+        # setStyleSheet re-polishes every widget in the hierarchy; skip the
+        # whole pass when the theme didn't actually change
+        if self._applied_theme == self._current_theme:
+            return
+        self._applied_theme = self._current_theme
         colors = THEMES.get(self._current_theme, THEMES["light"])
+        self._active_theme_colors = colors
         self.setStyleSheet(get_stylesheet(colors))
         
         # Clear HTML style cache as theme has changed
@@ -382,42 +597,76 @@ class MainWindow(QMainWindow):
         self._cached_style_key = None
         
         # Update theme action text to show current theme name (if present)
-        try:
-            if hasattr(self, "_theme_action"):
-                name = THEMES.get(self._current_theme, THEMES["light"])["name"]
-                # Strip possible leading emoji
-                if name and ord(name[0]) > 255:
-                    name = name[2:] if len(name) > 2 and name[1] == " " else name[1:]
-                try:
-                    self._theme_action.setText(name)
-                except Exception:
-                    self._theme_action.setText(name)
-        except Exception:
-            pass
+        if hasattr(self, "_theme_action"):
+            self._theme_action.setText(
+                _THEME_DISPLAY_NAMES.get(
+                    self._current_theme,
+                    _THEME_DISPLAY_NAMES[self.DEFAULT_THEME],
+                )
+            )
         # Refresh toolbar synchronously
+        self._toolbar_dirty = True
         self._refresh_toolbar_labels()
 
+        # Persistent menus were styled with the previous theme's colors;
+        # restyle them (cheap: per-theme stylesheet is cached)
+        for attr in ("_theme_menu", "_format_menu", "_font_menu"):
+            menu = getattr(self, attr, None)
+            if menu is not None:
+                self._make_menu_compact(menu)
+        if self._font_list is not None:
+            self._font_list.setStyleSheet(self._font_list_stylesheet())
+
+    def _menu_stylesheet(self) -> str:
+        """Compact QMenu stylesheet for the current theme (built once per theme)."""
+        cached = self._menu_qss_cache.get(self._current_theme)
+        if cached is not None:
+            return cached
+        colors = self._get_colors()
+        bg = colors.get("toolbar_bg", colors.get("bg", "#fff"))
+        fg = colors.get("fg", "#000")
+        item_bg = colors.get("content_bg", bg)
+        item_fg = colors.get("fg", fg)
+        select_bg = colors.get("select_bg", "#0078d7")
+        select_fg = colors.get("select_fg", "#fff")
+        qss = (
+            f"QMenu {{ background: {bg}; color: {fg}; padding: 4px; }}"
+            f"QMenu::item {{ padding: 4px 8px; min-height: 20px; background: {item_bg}; color: {item_fg}; }}"
+            f"QMenu::item:selected {{ background: {select_bg}; color: {select_fg}; }}"
+            f"QLineEdit {{ padding: 4px; margin: 2px; background: {bg}; color: {fg}; }}"
+        )
+        self._menu_qss_cache[self._current_theme] = qss
+        return qss
+
+    def _font_list_stylesheet(self) -> str:
+        """Font list stylesheet for the current theme (built once per theme)."""
+        cached = self._font_list_qss_cache.get(self._current_theme)
+        if cached is not None:
+            return cached
+        colors = self._get_colors()
+        select_bg = colors.get("select_bg", "#0078d7")
+        select_fg = colors.get("select_fg", "#ffffff")
+        fg = colors.get("fg", "#000000")
+        bg = colors.get("content_bg", "#ffffff")
+        hover_bg = colors.get("hover_bg", select_bg)
+        hover_fg = colors.get("hover_fg", select_fg)
+        qss = (
+            f"QListView::item {{ padding: 4px 8px; min-height: 22px; color: {fg}; background: {bg}; }}"
+            f"QListView::item:selected {{ background: {select_bg}; color: {select_fg}; }}"
+            f"QListView::item:hover {{ background: {hover_bg}; color: {hover_fg}; }}"
+        )
+        self._font_list_qss_cache[self._current_theme] = qss
+        return qss
+
     def _make_menu_compact(self, menu: QMenu) -> None:
         """Apply compact styling to a QMenu to reduce padding and item height and use theme colors."""
         try:
-            colors = self._get_colors()
-            bg = colors.get("toolbar_bg", colors.get("bg", "#fff"))
-            fg = colors.get("fg", "#000")
-            item_bg = colors.get("content_bg", bg)
-            item_fg = colors.get("fg", fg)
-            select_bg = colors.get("select_bg", "#0078d7")
-            select_fg = colors.get("select_fg", "#fff")
-            menu.setStyleSheet(
-                f"QMenu {{ background: {bg}; color: {fg}; padding: 4px; }}"
-                f"QMenu::item {{ padding: 4px 8px; min-height: 20px; background: {item_bg}; color: {item_fg}; }}"
-                f"QMenu::item:selected {{ background: {select_bg}; color: {select_fg}; }}"
-                f"QLineEdit {{ padding: 4px; margin: 2px; background: {bg}; color: {fg}; }}"
-            )
+            menu.setStyleSheet(self._menu_stylesheet())
         except Exception:
             pass
 
     def _get_colors(self) -> dict:
-        return THEMES.get(self._current_theme, THEMES["light"])
+        return self._active_theme_colors
 
     def _get_html_style(self) -> str:
         """Get cached HTML style or generate new one if cache is invalid"""
@@ -446,8 +695,16 @@ class MainWindow(QMainWindow):
             self._paragraph_spacing,
         )
         self._cached_style_key = style_key
+        self._cached_head_bytes = None
         return self._cached_html_style
 
+    def _get_html_head_bytes(self) -> bytes:
+        """Document head (styles only; scripts are page-injected) encoded once per settings change"""
+        style = self._get_html_style()  # May invalidate _cached_head_bytes
+        if self._cached_head_bytes is None:
+            self._cached_head_bytes = style.encode("utf-8")
+        return self._cached_head_bytes
+
     def showEvent(self, event) -> None:
         """After window shows, refresh toolbar state to ensure labels render correctly"""
         super().showEvent(event)
@@ -459,65 +716,83 @@ class MainWindow(QMainWindow):
         QTimer.singleShot(50, _refresh_all)
 
     def _open_theme_dialog(self) -> None:
-        # Show theme options using a menu anchored to the toolbar action
-        menu = QMenu(self)
-        for key, info in THEMES.items():
-            name = info.get("name", key)
-            act = QAction(name, self)
-            act.setData(key)
-            act.setCheckable(False)
-            act.triggered.connect(lambda checked=False, k=key: self._set_theme(k))
-            menu.addAction(act)
-        menu.aboutToHide.connect(lambda: setattr(self, '_menu_open', False))
+        # Show theme options using a menu anchored to the toolbar action.
+        # Themes don't change at runtime, so build the menu once and reuse it;
+        # popup() keeps the event loop running while it is open.
+        if not hasattr(self, "_theme_menu"):
+            menu = QMenu(self)
+            for key, info in THEMES.items():
+                name = info.get("name", key)
+                act = QAction(name, self)
+                act.setData(key)
+                act.setCheckable(False)
+                menu.addAction(act)
+            # One bound-method connection for the whole menu; the theme key
+            # travels in the action's data instead of a per-action lambda closure
+            menu.triggered.connect(self._on_theme_action)
+            menu.aboutToHide.connect(self._on_menu_hidden)
+            self._theme_menu = menu
         self._menu_open = True
         try:
             widget = self._toolbar.widgetForAction(self._theme_action)
             if widget:
-                menu.exec(widget.mapToGlobal(widget.rect().bottomLeft()))
+                self._theme_menu.popup(widget.mapToGlobal(widget.rect().bottomLeft()))
             else:
-                menu.exec(self.mapToGlobal(self.rect().center()))
+                self._theme_menu.popup(self.mapToGlobal(self.rect().center()))
         except Exception:
-            menu.exec(self.mapToGlobal(self.rect().center()))
+            self._theme_menu.popup(self.mapToGlobal(self.rect().center()))
+
+    def _on_theme_action(self, action: QAction) -> None:
+        key = action.data()
+        if key:
+            self._set_theme(key)
 
     def _set_theme(self, key: str) -> None:
+        # Re-picking the active theme shouldn't trigger a full re-style
+        # and chapter reload
+        if key == self._current_theme:
+            return
         self._current_theme = key
         self._apply_theme()
-        self._display_chapter()
+        self._apply_css_live()
         self._save_settings()
 
     def _open_format_dialog(self) -> None:
-        # Use a menu to present formatting operations; clicks do not close the menu (remain open)
-        menu = QMenu(self)
-        self._make_menu_compact(menu)
-        from PyQt6.QtWidgets import QPushButton
-
-        ops = [
-            ("增大字号", self._zoom_in),
-            ("减小字号", self._zoom_out),
-            ("增加行间距", self._increase_line_spacing),
-            ("减小行间距", self._decrease_line_spacing),
-            ("增加段间距", self._increase_paragraph_spacing),
-            ("减小段间距", self._decrease_paragraph_spacing),
-        ]
-        for label, cb in ops:
-            btn = QPushButton(label)
-            btn.setFlat(True)
-            btn.setStyleSheet("text-align: left; padding: 4px 12px;")
-            btn.clicked.connect(cb)
-            action = QWidgetAction(menu)
-            action.setDefaultWidget(btn)
-            menu.addAction(action)
+        # Use a menu to present formatting operations; clicks do not close the
+        # menu (remain open). Built once and reused across opens.
+        if not hasattr(self, "_format_menu"):
+            menu = QMenu(self)
+            self._make_menu_compact(menu)
+            from PyQt6.QtWidgets import QPushButton
+
+            ops = [
+                ("增大字号", self._zoom_in),
+                ("减小字号", self._zoom_out),
+                ("增加行间距", self._increase_line_spacing),
+                ("减小行间距", self._decrease_line_spacing),
+                ("增加段间距", self._increase_paragraph_spacing),
+                ("减小段间距", self._decrease_paragraph_spacing),
+            ]
+            for label, cb in ops:
+                btn = QPushButton(label)
+                btn.setFlat(True)
+                btn.setStyleSheet("text-align: left; padding: 4px 12px;")
+                btn.clicked.connect(cb)
+                action = QWidgetAction(menu)
+                action.setDefaultWidget(btn)
+                menu.addAction(action)
+            menu.aboutToHide.connect(self._on_menu_hidden)
+            self._format_menu = menu
         # Pop up menu under toolbar button
-        menu.aboutToHide.connect(lambda: setattr(self, '_menu_open', False))
         self._menu_open = True
         try:
             widget = self._toolbar.widgetForAction(self._format_action)
             if widget:
-                menu.exec(widget.mapToGlobal(widget.rect().bottomLeft()))
+                self._format_menu.popup(widget.mapToGlobal(widget.rect().bottomLeft()))
             else:
-                menu.exec(self.mapToGlobal(self.rect().center()))
+                self._format_menu.popup(self.mapToGlobal(self.rect().center()))
         except Exception:
-            menu.exec(self.mapToGlobal(self.rect().center()))
+            self._format_menu.popup(self.mapToGlobal(self.rect().center()))
 
     # ==================== File operations ====================
 
@@ -537,6 +812,11 @@ class MainWindow(QMainWindow):
 
         if success:
             self._last_opened = path
+            # Fetch state belongs to the previous book; without the reset a
+            # remembered failure (or in-flight worker) would block loading
+            # the same index in this one
+            self._fetching_chapter = None
+            self._failed_fetch = None
             self.setWindowTitle(f"EPUB 酷读器 - {result}")
             self._update_toc()
             if self._loader.chapter_count() > 0:
@@ -559,22 +839,40 @@ class MainWindow(QMainWindow):
 
     def _update_toc(self) -> None:
         """Update the TOC tree; supports nested structure"""
-        self._toc_tree.clear()
-        
         # Use the new flattened TOC
         toc_items = self._loader.get_flat_toc()
-        
+
+        # Build items detached from the tree, then bulk-insert with updates
+        # and signals off, so the widget lays out and repaints once instead
+        # of once per entry
+        items = []
+        self._chapter_to_item.clear()
+        # Tree is being rebuilt; the remembered selection no longer applies
+        self._last_selected_toc = None
         for item in toc_items:
             title = item['title']
             chapter_idx = item['chapter_idx']
-            
-            tree_item = QTreeWidgetItem(self._toc_tree, [title])
+
+            tree_item = QTreeWidgetItem([title])
             tree_item.setToolTip(0, title)
-            
+
             # Save chapter index to user data
             if chapter_idx is not None:
                 tree_item.setData(0, Qt.ItemDataRole.UserRole, chapter_idx)
-        
+                # First entry wins when several rows share a chapter
+                self._chapter_to_item.setdefault(chapter_idx, tree_item)
+            items.append(tree_item)
+
+        self._toc_tree.setUpdatesEnabled(False)
+        self._toc_tree.blockSignals(True)
+        try:
+            self._toc_tree.setSortingEnabled(False)
+            self._toc_tree.clear()
+            self._toc_tree.addTopLevelItems(items)
+        finally:
+            self._toc_tree.blockSignals(False)
+            self._toc_tree.setUpdatesEnabled(True)
+
         self._update_toc_selection()
         
         # Update chapter count
@@ -595,6 +893,8 @@ class MainWindow(QMainWindow):
         
         if idx is not None and 0 <= idx < self._loader.chapter_count() and idx != self._current_chapter:
             self._current_chapter = idx
+            # Navigating away invalidates any remembered fetch failure
+            self._failed_fetch = None
             # Treat click navigation as an explicit navigation; display from top of chapter
             self._display_chapter(preserve_position=False)
 
@@ -605,73 +905,92 @@ class MainWindow(QMainWindow):
         index alone can be misaligned. Prefer matching items that store a `chapter_idx`; if none
         match, fall back to selecting the nearest TOC item based on chapter_idx.
         """
-        count = self._toc_tree.topLevelItemCount()
-        found_item = None
-
-        # Prefer items that store a chapter_idx matching the current chapter
-        for i in range(count):
-            it = self._toc_tree.topLevelItem(i)
-            # Guard against possible None (pyqt API may return None)
-            if it is None:
-                continue
-
-            chapter_idx = it.data(0, Qt.ItemDataRole.UserRole)
-            if chapter_idx == self._current_chapter:
-                found_item = it
-                break
-
-        # Fallback: find the nearest TOC item based on chapter_idx
-        if not found_item and count > 0:
-            best_item = None
-            best_diff = float('inf')
-            
-            for i in range(count):
-                it = self._toc_tree.topLevelItem(i)
-                if it is None:
-                    continue
-                
-                chapter_idx = it.data(0, Qt.ItemDataRole.UserRole)
-                if chapter_idx is None:
-                    continue
-                
-                # Find the TOC item with smallest positive difference (current >= chapter_idx)
-                # This means: show the latest chapter that we've already passed
-                if self._current_chapter >= chapter_idx:
-                    diff = self._current_chapter - chapter_idx
-                    if diff < best_diff:
-                        best_diff = diff
-                        best_item = it
-            
-            # If current chapter is before all TOC items, select the first TOC item
-            if best_item is None:
-                best_item = self._toc_tree.topLevelItem(0)
-            
-            found_item = best_item
+        # Selection already reflects this chapter (e.g. zoom/spacing
+        # re-renders); skip the lookup and scroll
+        if self._last_selected_toc == self._current_chapter:
+            return
+        # O(1) lookup via the map built alongside the tree in _update_toc
+        found_item = self._chapter_to_item.get(self._current_chapter)
+
+        if found_item is None:
+            # Fallback: show the latest chapter heading we've already passed
+            best_idx = -1
+            for chapter_idx, it in self._chapter_to_item.items():
+                if best_idx < chapter_idx <= self._current_chapter:
+                    best_idx = chapter_idx
+                    found_item = it
+
+            # Current chapter precedes every indexed entry (or no entry
+            # carries an index): select the first row
+            if found_item is None and self._toc_tree.topLevelItemCount() > 0:
+                found_item = self._toc_tree.topLevelItem(0)
 
         if found_item:
-            self._toc_tree.setCurrentItem(found_item)
+            # Programmatic selection; keep tree signals from echoing back
+            # into navigation handlers
+            self._toc_tree.blockSignals(True)
+            try:
+                self._toc_tree.setCurrentItem(found_item)
+            finally:
+                self._toc_tree.blockSignals(False)
             self._toc_tree.scrollToItem(found_item)
+            self._last_selected_toc = self._current_chapter
+
+    def _refresh_chapter_indicators(self) -> None:
+        """Sync the progress label and TOC highlight with the current chapter."""
+        total = self._loader.chapter_count()
+        if self._progress_label:
+            self._progress_label.setText(f" {self._current_chapter + 1}/{total} ")
+        self._update_toc_selection()
 
     def _display_chapter(self, preserve_position: bool = True) -> None:
+        """Schedule a render of the current chapter.
+
+        Rapid successive requests (e.g. a held zoom shortcut auto-repeating)
+        coalesce into one render on the timer tick; the most recent
+        preserve_position wins.
+        """
+        self._pending_preserve = preserve_position
+        # Navigation renders on the next event-loop turn; setting tweaks are
+        # auto-repeatable, so give them a 120 ms window that outlasts the
+        # keyboard repeat rate and collapses the whole burst
+        self._render_timer.start(0 if not preserve_position else 120)
+
+    def _do_display_chapter(self) -> None:
         """Render the current chapter.
 
         When preserve_position=True, attempt to restore the current page scroll position (as a proportion of document height)
         to avoid large jumps when changing font/theme/line spacing settings.
         When preserve_position=False (typically triggered by navigation), display from the top of the chapter.
         """
-        content = self._loader.get_chapter_content(self._current_chapter)
+        preserve_position = self._pending_preserve
+        index = self._current_chapter
+        content = self._loader.get_cached_chapter(index)
+
+        if (
+            content is None
+            and self._loader.chapter_count() > 0
+            and self._failed_fetch != index
+        ):
+            # Cold chapter (fresh open or long jump): zip read + parse would
+            # block the UI thread, so update the indicators now for instant
+            # feedback and re-enter here once the worker has filled the cache
+            self._refresh_chapter_indicators()
+            if self._fetching_chapter != index:
+                self._fetching_chapter = index
+                QThreadPool.globalInstance().start(
+                    partial(self._fetch_chapter_in_background, index)
+                )
+            return
+
         page = self._browser.page()
 
         # If page is unavailable (rare environments or during init), render directly and return
         if page is None:
-            html = self._get_html_style()
-            html += _MOUSE_HANDLER_JS + _SCROLL_JS + (content or "") + "</body></html>"
-            self._browser.setHtml(html)
+            data = self._get_html_head_bytes() + (content or b"") + b"</body></html>"
+            self._browser.setContent(data, "text/html;charset=utf-8")
             self._loader.preload_chapters(self._current_chapter)
-            total = self._loader.chapter_count()
-            if self._progress_label:
-                self._progress_label.setText(f" {self._current_chapter + 1}/{total} ")
-            self._update_toc_selection()
+            self._refresh_chapter_indicators()
             return
 
         def _set_html_and_restore(ratio: float):
@@ -680,9 +999,8 @@ class MainWindow(QMainWindow):
             except Exception:
                 ratio = 0.0
 
-            # Use cached HTML style
-            html = self._get_html_style()
-            html += _MOUSE_HANDLER_JS + _SCROLL_JS + (content or "") + "</body></html>"
+            # Cached pre-encoded head; content is already UTF-8 bytes
+            data = self._get_html_head_bytes() + (content or b"") + b"</body></html>"
 
             # Record whether to restore scroll (by ratio)
             if preserve_position:
@@ -693,68 +1011,101 @@ class MainWindow(QMainWindow):
                 self._pending_scroll_chapter = None
 
             # Set content and preload adjacent chapters
-            self._browser.setHtml(html)
+            self._browser.setContent(data, "text/html;charset=utf-8")
+            # Fresh page: top for navigation, restored ratio otherwise (the
+            # restore scroll events re-sync the tracked value afterwards)
+            self._current_scroll_ratio = ratio if preserve_position else 0.0
             self._loader.preload_chapters(self._current_chapter)
 
-            # Restore scroll position after page load (attempt once + slightly delayed repeat to improve success rate)
-            def _on_load(ok: bool):
-                try:
-                    if not preserve_position or self._pending_scroll_ratio is None:
-                        return
-                    if self._pending_scroll_chapter != self._current_chapter:
-                        return
-
-                    ratio_local = max(0.0, min(1.0, float(self._pending_scroll_ratio)))
-                    page.runJavaScript(f"setScrollRatio({ratio_local})", lambda _: None)
-                    QTimer.singleShot(60, lambda: page.runJavaScript(f"setScrollRatio({ratio_local})", lambda _: None))
-                finally:
-                    try:
-                        page.loadFinished.disconnect(_on_load)
-                    except Exception:
-                        pass
-
-            page.loadFinished.connect(_on_load)
-
         if content is None:
             # Even if content is missing, update progress and TOC selection
-            total = self._loader.chapter_count()
-            if self._progress_label:
-                self._progress_label.setText(f" {self._current_chapter + 1}/{total} ")
-            self._update_toc_selection()
+            self._refresh_chapter_indicators()
             return
 
-        if preserve_position:
-            # First get current page scroll ratio, then render new content and try to restore
-            try:
-                page.runJavaScript("getScrollRatio()", _set_html_and_restore)
-            except Exception:
-                _set_html_and_restore(0.0)
-        else:
-            _set_html_and_restore(0.0)
+        # The page pushes its scroll ratio to Python as the user scrolls, so
+        # re-renders can reuse the last known value instead of paying a
+        # getScrollRatio IPC round-trip before every setContent
+        _set_html_and_restore(self._current_scroll_ratio if preserve_position else 0.0)
 
         # Update progress and TOC selection
-        total = self._loader.chapter_count()
-        if self._progress_label:
-            self._progress_label.setText(f" {self._current_chapter + 1}/{total} ")
-        self._update_toc_selection()
+        self._refresh_chapter_indicators()
+
+    def _on_page_loaded(self, ok: bool) -> None:
+        """Permanent loadFinished slot: restore the pending scroll position.
+
+        Connected once in _setup_ui and driven by the _pending_scroll_*
+        attributes, so chapter renders no longer allocate and tear down a
+        signal connection (and closure) per load.
+        """
+        # Fresh document: re-push the reading-mode fast-path flag (page-side
+        # globals don't survive navigation)
+        self._sync_reading_mode_flags()
+
+        if self._pending_scroll_ratio is None:
+            return
+        if self._pending_scroll_chapter != self._current_chapter:
+            return
+        ratio = max(0.0, min(1.0, float(self._pending_scroll_ratio)))
+        self._pending_scroll_ratio = None
+        self._pending_scroll_chapter = None
+        page = self._browser.page()
+        if page is not None:
+            # One fire-and-forget IPC call; the JS side retries on its own
+            # (rAF + 60 ms) and returns nothing to marshal
+            page.runJavaScript(f"restoreScrollRatio({ratio})")
+
+    def _fetch_chapter_in_background(self, index: int) -> None:
+        """Worker-thread entry: fill the loader cache, then signal the UI thread."""
+        try:
+            self._loader.get_chapter_content(index)
+        except Exception:
+            pass
+        self._chapter_ready.emit(index)
+
+    def _on_chapter_ready(self, index: int) -> None:
+        """A background chapter parse finished; re-render if still relevant."""
+        if self._fetching_chapter != index:
+            # Stale completion: a book swap reset the fetch state or a newer
+            # fetch superseded this one — its result must not be judged
+            # against the current book's cache
+            return
+        self._fetching_chapter = None
+        if index != self._current_chapter:
+            return
+        if self._loader.get_cached_chapter(index) is None:
+            # Parse failed; remember so the render path doesn't loop on it
+            self._failed_fetch = index
+        else:
+            self._failed_fetch = None
+        self._do_display_chapter()
 
     def _goto_chapter(self, index: int) -> None:
         if 0 <= index < self._loader.chapter_count():
+            # Jumping to the chapter we're already on would only reset the
+            # scroll position and waste a render
+            if index == self._current_chapter:
+                return
             self._current_chapter = index
+            self._failed_fetch = None
             # Programmatic jumps also start from chapter top
             self._display_chapter(preserve_position=False)
 
+    def _goto_last_chapter(self) -> None:
+        self._goto_chapter(self._loader.chapter_count() - 1)
+
     # ==================== 导航 ====================
 
     def prev_chapter(self) -> None:
         if self._current_chapter > 0:
             self._current_chapter -= 1
+            self._failed_fetch = None
             # When navigating to previous chapter, display from chapter top
             self._display_chapter(preserve_position=False)
 
     def next_chapter(self) -> None:
         if self._current_chapter < self._loader.chapter_count() - 1:
             self._current_chapter += 1
+            self._failed_fetch = None
             # When navigating to next chapter, display from chapter top
             self._display_chapter(preserve_position=False)
 
@@ -764,34 +1115,100 @@ class MainWindow(QMainWindow):
 
     # ==================== 显示设置 ====================
 
+    def _apply_css_live(self) -> None:
+        """Swap the chapter stylesheet in the live page after a theme change.
+
+        Replaces the reader-style element's text with freshly generated CSS,
+        so the parsed DOM survives and the renderer only reflows. Falls back
+        to a full re-render when no page is available. Later full renders
+        regenerate the head through the usual style cache.
+        """
+        page = self._browser.page()
+        if page is None:
+            self._display_chapter()
+            return
+        css = generate_html_css(
+            self._get_colors(),
+            self._font_family,
+            int(self._font_size * self._font_scale),
+            self._line_spacing,
+            self._paragraph_spacing,
+        )
+        page.runJavaScript(
+            "var s = document.getElementById('reader-style');"
+            f"if (s) s.textContent = {json.dumps(css)};"
+        )
+
+    def _apply_live_style(self) -> None:
+        """Push font/spacing settings into the live page via CSS variables.
+
+        The chapter HTML reads these values from ``:root`` custom properties,
+        so zoom and spacing tweaks only need to update the properties in place
+        instead of rebuilding and reloading the whole document. Falls back to
+        a full re-render when no page is loaded yet. The next real render
+        still picks up the new values through _get_html_style's cache key.
+        """
+        page = self._browser.page()
+        if page is None:
+            self._display_chapter()
+            return
+        font_size = int(self._font_size * self._font_scale)
+        family = json.dumps(self._font_family, ensure_ascii=False)
+        page.runJavaScript(
+            "var s = document.documentElement.style;"
+            f"s.setProperty('--font-size', '{font_size}px');"
+            f"s.setProperty('--line-spacing', '{self._line_spacing:g}');"
+            f"s.setProperty('--para-spacing', '{self._paragraph_spacing:g}em');"
+            f"s.setProperty('--font-family', {family});"
+        )
+
     def _zoom_in(self) -> None:
-        self._font_scale = min(2.0, self._font_scale + 0.1)
-        self._display_chapter()
+        # Already clamped at the limit: no visual or persisted change
+        new = min(2.0, self._font_scale + 0.1)
+        if new == self._font_scale:
+            return
+        self._font_scale = new
+        self._apply_live_style()
         self._save_settings()
 
     def _zoom_out(self) -> None:
-        self._font_scale = max(0.5, self._font_scale - 0.1)
-        self._display_chapter()
+        new = max(0.5, self._font_scale - 0.1)
+        if new == self._font_scale:
+            return
+        self._font_scale = new
+        self._apply_live_style()
         self._save_settings()
 
     def _increase_line_spacing(self) -> None:
-        self._line_spacing = min(3.0, self._line_spacing + 0.1)
-        self._display_chapter()
+        new = min(3.0, self._line_spacing + 0.1)
+        if new == self._line_spacing:
+            return
+        self._line_spacing = new
+        self._apply_live_style()
         self._save_settings()
 
     def _decrease_line_spacing(self) -> None:
-        self._line_spacing = max(1.2, self._line_spacing - 0.1)
-        self._display_chapter()
+        new = max(1.2, self._line_spacing - 0.1)
+        if new == self._line_spacing:
+            return
+        self._line_spacing = new
+        self._apply_live_style()
         self._save_settings()
 
     def _increase_paragraph_spacing(self) -> None:
-        self._paragraph_spacing = min(3.0, self._paragraph_spacing + 0.2)
-        self._display_chapter()
+        new = min(3.0, self._paragraph_spacing + 0.2)
+        if new == self._paragraph_spacing:
+            return
+        self._paragraph_spacing = new
+        self._apply_live_style()
         self._save_settings()
 
     def _decrease_paragraph_spacing(self) -> None:
-        self._paragraph_spacing = max(0.4, self._paragraph_spacing - 0.2)
-        self._display_chapter()
+        new = max(0.4, self._paragraph_spacing - 0.2)
+        if new == self._paragraph_spacing:
+            return
+        self._paragraph_spacing = new
+        self._apply_live_style()
         self._save_settings()
 
     def _toggle_images(self) -> None:
@@ -800,13 +1217,35 @@ class MainWindow(QMainWindow):
         self._display_chapter()
         self._save_settings()
 
+    def _sync_reading_mode_flags(self) -> None:
+        """Propagate reading mode to the bridge and the page-side fast path.
+
+        With the flag mirrored, clicks outside reading mode are dropped in
+        JS before any bridge IPC, and the bridge slot itself bails without
+        touching window properties.
+        """
+        self._web_bridge.set_reading_mode(self._reading_mode)
+        page = self._browser.page()
+        if page is not None:
+            page.runJavaScript(
+                f"window.__readingMode = {'true' if self._reading_mode else 'false'}"
+            )
+
     def _toggle_reading_mode(self) -> None:
         self._reading_mode = not self._reading_mode
+        self._sync_reading_mode_flags()
+        # Label state changed; let the next refresh re-sync the toolbar
+        self._toolbar_dirty = True
         if self._reading_btn:
-            self._reading_btn.setText("阅读中" if self._reading_mode else "阅读模式")
-            self._reading_btn.setToolTip(
-                "关闭阅读模式" if self._reading_mode else "开启阅读模式 (Ctrl+M)"
-            )
+            # Batch the text + tooltip mutation into a single toolbar repaint
+            self._toolbar.setUpdatesEnabled(False)
+            try:
+                self._reading_btn.setText("阅读中" if self._reading_mode else "阅读模式")
+                self._reading_btn.setToolTip(
+                    "关闭阅读模式" if self._reading_mode else "开启阅读模式 (Ctrl+M)"
+                )
+            finally:
+                self._toolbar.setUpdatesEnabled(True)
 
         status_bar = self.statusBar()
         if status_bar:
@@ -833,7 +1272,7 @@ class MainWindow(QMainWindow):
     def _create_font_menu(self) -> None:
         self._font_menu = QMenu(self)
         self._make_menu_compact(self._font_menu)
-        self._font_menu.aboutToHide.connect(lambda: setattr(self, '_menu_open', False))
+        self._font_menu.aboutToHide.connect(self._on_menu_hidden)
         container = QWidget()
         # Reduce container padding for compact display
         container.setStyleSheet("QWidget { padding: 0px; margin: 0px; }")
@@ -841,80 +1280,71 @@ class MainWindow(QMainWindow):
         layout.setContentsMargins(4, 4, 4, 4)
         layout.setSpacing(4)
         # Small font to save space
-        small_font = QFont(self.DEFAULT_FONT, 11)
+        small_font = self.MENU_FONT
         # Search box
         search = QLineEdit()
         search.setPlaceholderText("搜索字体...")
         search.setFixedHeight(26)
         search.setFont(small_font)
         layout.addWidget(search)
-        # Font list (each item rendered in its own font for preview)
-        from PyQt6.QtWidgets import QListWidgetItem
-
-        font_list = QListWidget()
+        # Font list: QListView over a flat string model (no per-font
+        # QListWidgetItem allocations); the delegate renders each row in
+        # its own family for preview
+        font_list = QListView()
         font_list.setFont(small_font)
         font_list.setSpacing(2)
-        colors = self._get_colors()
-        select_bg = colors.get("select_bg", "#0078d7")
-        select_fg = colors.get("select_fg", "#ffffff")
-        fg = colors.get("fg", "#000000")
-        bg = colors.get("content_bg", "#ffffff")
-        hover_bg = colors.get("hover_bg", select_bg)
-        hover_fg = colors.get("hover_fg", select_fg)
-        font_list.setStyleSheet(
-            f"QListWidget::item {{ padding: 4px 8px; min-height: 22px; color: {fg}; background: {bg}; }}"
-            f"QListWidget::item:selected {{ background: {select_bg}; color: {select_fg}; }}"
-            f"QListWidget::item:hover {{ background: {hover_bg}; color: {hover_fg}; }}"
-        )
+        font_list.setEditTriggers(QListView.EditTrigger.NoEditTriggers)
+        font_list.setStyleSheet(self._font_list_stylesheet())
+        self._font_list = font_list
         font_list.setMouseTracking(True)
-        
-        # Load fonts asynchronously - only when menu is about to show
-        self._all_fonts = None  # Cache font list for future uses
-        
-        def populate(names):
-            font_list.clear()
-            for name in names:
-                it = QListWidgetItem(name)
-                it.setFont(QFont(name, 14))
-                it.setSizeHint(QSize(360, 26))
-                font_list.addItem(it)
-        
-        def get_all_fonts():
-            if self._all_fonts is None:
-                # Load fonts only when needed (lazy loading)
-                self._all_fonts = sorted(
-                    [f for f in QFontDatabase.families() if not f.startswith("@")]
-                )
-            return self._all_fonts
-        
-        # Populate with initial set when menu is about to show
+        model = QStringListModel(self._font_menu)
+        proxy = QSortFilterProxyModel(self._font_menu)
+        proxy.setSourceModel(model)
+        proxy.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        font_list.setModel(proxy)
+        font_list.setItemDelegate(_FontPreviewDelegate(font_list))
+
+        # Populate with full set on first show only
         def on_menu_about_to_show():
-            fonts = get_all_fonts()
-            populate(fonts)
-            font_list.setFixedWidth(420)
-            font_list.setMinimumHeight(min(800, 26 * len(fonts)))
-        
+            fonts = _get_fonts()
+            if not model.rowCount():
+                model.setStringList(fonts)
+                font_list.setFixedWidth(420)
+                font_list.setMinimumHeight(min(800, 26 * len(fonts)))
+            # Highlight the active font; the list is sorted, so bisect
+            # finds it in O(log N) instead of a linear scan
+            idx = bisect.bisect_left(fonts, self._font_family)
+            if idx < len(fonts) and fonts[idx] == self._font_family:
+                proxy_idx = proxy.mapFromSource(model.index(idx))
+                if proxy_idx.isValid():
+                    font_list.setCurrentIndex(proxy_idx)
+                    font_list.scrollTo(proxy_idx)
+
         self._font_menu.aboutToShow.connect(on_menu_about_to_show)
         layout.addWidget(font_list)
 
         # Click or double-click to select
-        def on_select(item):
-            name = item.text()
+        def on_select(index):
+            name = index.data()
+            if not name:
+                return
             self._font_family = name
-            self._display_chapter()
+            self._apply_live_style()
             self._save_settings()
             self._font_menu.hide()
 
-        font_list.itemClicked.connect(on_select)
-        font_list.itemDoubleClicked.connect(on_select)
+        font_list.clicked.connect(on_select)
+        font_list.doubleClicked.connect(on_select)
 
-        # Filtering
-        def on_search(text: str):
-            fonts = get_all_fonts()
-            filtered = [f for f in fonts if text.lower() in f.lower()]
-            populate(filtered)
-
-        search.textChanged.connect(on_search)
+        # Filtering runs in the proxy model (C++-side scan, no Python loop).
+        # Debounced so fast typing collapses into a single pass.
+        filter_timer = QTimer(self._font_menu)
+        filter_timer.setSingleShot(True)
+        filter_timer.setInterval(80)
+        filter_timer.timeout.connect(
+            lambda: proxy.setFilterFixedString(search.text())
+        )
+        search.textChanged.connect(lambda _text: filter_timer.start())
         # Embed container into QMenu as QWidgetAction for complex dropdown layout
         action = QWidgetAction(self._font_menu)
         action.setDefaultWidget(container)
@@ -923,6 +1353,15 @@ class MainWindow(QMainWindow):
     # ==================== Settings persistence ====================
 
     def _save_settings(self) -> None:
+        """Schedule a settings write; rapid successive calls coalesce into one"""
+        self._save_timer.start()
+
+    def _do_save_settings(self) -> None:
+        # saveGeometry + base64 only reruns after an actual move/resize;
+        # settings-only saves reuse the cached string
+        if self._geometry_dirty or self._geometry_b64 is None:
+            self._geometry_b64 = bytes(self.saveGeometry().toBase64()).decode("ascii")
+            self._geometry_dirty = False
         self._settings.save(
             {
                 "last_opened": self._last_opened,
@@ -935,7 +1374,7 @@ class MainWindow(QMainWindow):
                 "show_images": self._show_images,
                 "reading_mode": self._reading_mode,
                 "toc_visible": self._toc_visible,
-                "window_geometry": self.saveGeometry().toHex().data().decode(),
+                "window_geometry": self._geometry_b64,
             }
         )
 
@@ -955,6 +1394,7 @@ class MainWindow(QMainWindow):
         self._reading_mode = data.get("reading_mode", False)
         self._toc_visible = data.get("toc_visible", True)
 
+        self._sync_reading_mode_flags()
         self._loader.set_image_visibility(self._show_images)
         self._toc_widget.setVisible(self._toc_visible)
 
@@ -962,14 +1402,25 @@ class MainWindow(QMainWindow):
             self._reading_btn.setText("阅读中" if self._reading_mode else "阅读模式")
 
         if "window_geometry" in data:
-            from PyQt6.QtCore import QByteArray
-
-            self.restoreGeometry(QByteArray.fromHex(data["window_geometry"].encode()))
+            raw = data["window_geometry"].encode()
+            # Geometry is stored base64; fall back to the old hex encoding for
+            # settings files written by earlier versions (restoreGeometry
+            # rejects garbage, so a failed decode is harmless)
+            if not self.restoreGeometry(QByteArray.fromBase64(raw)):
+                self.restoreGeometry(QByteArray.fromHex(raw))
 
     def resizeEvent(self, a0) -> None:
         super().resizeEvent(a0)
-        self._maybe_update_toolbar_compact()
+        self._geometry_dirty = True
+        self._resize_timer.start()
+
+    def moveEvent(self, a0) -> None:
+        super().moveEvent(a0)
+        self._geometry_dirty = True
 
     def closeEvent(self, a0) -> None:
-        self._save_settings()
+        # Flush any pending debounced save synchronously
+        self._save_timer.stop()
+        self._do_save_settings()
+        self._loader.close()
         a0.accept()
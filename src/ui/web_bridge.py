@@ -13,12 +13,25 @@ class WebBridge(QObject):
     def __init__(self, parent: "MainWindow"):
         super().__init__(parent)
         self._main_window = parent
+        # Mirrored from the window on every mode change so the click slot
+        # can bail out without going through the window's properties
+        self._reading_mode = False
+
+    def set_reading_mode(self, enabled: bool) -> None:
+        """Mirror the window's reading-mode flag for the click fast path"""
+        self._reading_mode = bool(enabled)
 
     @pyqtSlot(str)
     def onMouseClick(self, button: str) -> None:
         """Handle mouse click events (in reading mode)"""
-        if self._main_window.reading_mode and not self._main_window.menu_open:
-            if button == "left":
-                self._main_window.next_chapter()
-            elif button == "right":
-                self._main_window.prev_chapter()
+        if not self._reading_mode or self._main_window.menu_open:
+            return
+        if button == "left":
+            self._main_window.next_chapter()
+        elif button == "right":
+            self._main_window.prev_chapter()
+
+    @pyqtSlot(float)
+    def onScrollRatio(self, ratio: float) -> None:
+        """Receive the debounced scroll position pushed by the page"""
+        self._main_window.update_scroll_ratio(ratio)